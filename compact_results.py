@@ -0,0 +1,126 @@
+# 紧凑的模拟结果表示与绘图降采样
+# CompactResult 只保存时间轴与乳糖浓度 L：半乳糖由 Gal = L0 - L 得到，反应速率按需由 L 求导，
+# 可选 float32 存储，相同 (t_max, steps) 的结果共用同一个只读时间轴。
+# 为兼容原有代码，CompactResult 可以像 simulate 的返回值一样解包：t_hour, L, Gal, rates = result
+# lttb / minmax 降采样把曲线压缩到几百个点再交给 matplotlib，视觉上与原曲线一致。
+
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=64)
+def shared_time_axis(t_max, steps):
+    # 与 lactose_model.simulate 相同的时间轴（小时），同一进程内按 (t_max, steps) 共享
+    t_hour = np.linspace(0, t_max * 60, steps) / 60
+    t_hour.flags.writeable = False
+    return t_hour
+
+
+class CompactResult:
+    __slots__ = ("L0", "t_hour", "L")
+
+    def __init__(self, L0, t_hour, L):
+        self.L0 = float(L0)
+        self.t_hour = t_hour
+        self.L = L
+
+    @classmethod
+    def from_simulation(cls, L0, result, dtype=np.float64):
+        # result 为 simulate 的返回值 (t_hour, L, Gal, rates)；dtype=np.float32 时内存减半
+        t_hour, L = result[0], result[1]
+        if len(t_hour) > 1:
+            shared = shared_time_axis(float(t_hour[-1]), len(t_hour))
+            if np.array_equal(shared, t_hour):
+                t_hour = shared
+        return cls(L0, t_hour, np.asarray(L, dtype=dtype))
+
+    @property
+    def Gal(self):
+        return np.maximum(self.L0 - self.L, 0)
+
+    @property
+    def rates(self):
+        L = self.L.astype(np.float64)
+        if len(L) < 2:
+            return np.zeros_like(L)
+        return np.abs(np.gradient(L, self.t_hour))
+
+    @property
+    def nbytes(self):
+        return self.t_hour.nbytes + self.L.nbytes
+
+    def __iter__(self):
+        return iter((self.t_hour, self.L, self.Gal, self.rates))
+
+    def __len__(self):
+        return len(self.L)
+
+    # 序列化时不保存时间轴，反序列化后重新取共享时间轴
+    def __getstate__(self):
+        t_hour = self.t_hour
+        regular = len(t_hour) > 1 and np.array_equal(shared_time_axis(float(t_hour[-1]), len(t_hour)), t_hour)
+        return self.L0, (float(t_hour[-1]), len(t_hour)) if regular else t_hour, self.L
+
+    def __setstate__(self, state):
+        self.L0, t_hour, self.L = state
+        self.t_hour = shared_time_axis(*t_hour) if isinstance(t_hour, tuple) else t_hour
+
+
+def lttb(x, y, threshold):
+    # Largest-Triangle-Three-Buckets 降采样，返回保留点的下标（保留首尾点），点数不超过 threshold
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        # 只够保留首尾点（threshold 为 1 时只保留首点）
+        return np.array([0, n - 1][:max(threshold, 0)], dtype=int)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 下一个桶的平均点（最后一个桶使用末点）
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_buckets(y, n_buckets):
+    # 最小/最大值分桶降采样，返回保留点的下标（每桶保留极值点，并保留首尾点），点数不超过 2 * n_buckets + 2
+    n = len(y)
+    if 2 * n_buckets + 2 >= n:
+        return np.arange(n)
+    if n_buckets < 1:
+        return np.unique([0, n - 1])
+    y = np.asarray(y)
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    keep = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        segment = y[start:end]
+        keep.append(start + int(np.argmin(segment)))
+        keep.append(start + int(np.argmax(segment)))
+    return np.unique(keep)
+
+
+def decimate_xy(x, y, max_points=400, method="lttb"):
+    # 对一条曲线降采样，返回 (x, y)，点数不超过 max_points
+    x = np.asarray(x)
+    y = np.asarray(y)
+    # max_points < 4 时容不下一个最小/最大值桶，改用 lttb
+    if method == "minmax" and max_points >= 4:
+        indices = minmax_buckets(y, max_points // 2 - 1)
+    else:
+        indices = lttb(x, y, max_points)
+    return x[indices], y[indices]
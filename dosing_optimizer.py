@@ -0,0 +1,119 @@
+# 酶用量 E 与反应时间 t_max 的成本优化
+# 四种动力学方程中 Gal = L0 - L，dL/dt = -Vmax·L / 分母(L) 可分离变量：
+#     t = (1 / Vmax) · ∫_L^L0 分母(x) / x dx
+# 积分有解析解，因此达到目标转化率所需时间为闭式表达，且与 E（即 Vmax）成反比。
+# 单批成本 = 酶单价 × E × 体积 + 反应器小时成本 × (t + 固定辅助时间)，
+# 形如 a·E + b/E，最优剂量 E* = sqrt(b / a)，再按 E 与 t_max 的上下限截断。
+# 所有函数均支持 numpy 广播，可对一组 L0（或其他参数）一次完成计算。
+# 时间单位与页面一致：模型在分钟尺度积分（Vmax = E，单位 mM/分钟），对外以小时表示。
+
+import numpy as np
+
+from lactose_model import simulate
+
+
+def conversion_integral(L0, L, Km, Ki, inhibition_type):
+    # ∫_L^L0 分母(x) / x dx，分母与 lactose_model.model 中的定义一致
+    L0, L, Km, Ki = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (L0, L, Km, Ki)))
+    log_term = np.log(L0 / L)
+    delta = L0 - L
+    delta_sq = (L0 ** 2 - L ** 2) / 2
+    a = 1 + L0 / Ki
+    if inhibition_type == "competitive":
+        # Km·(1 + (L0 - x)/Ki) + x
+        return Km * a * log_term + (1 - Km / Ki) * delta
+    if inhibition_type == "non_competitive":
+        # (Km + x)·(1 + (L0 - x)/Ki)
+        return Km * a * log_term + (a - Km / Ki) * delta - delta_sq / Ki
+    if inhibition_type == "uncompetitive":
+        # Km + x·(1 + (L0 - x)/Ki)
+        return Km * log_term + a * delta - delta_sq / Ki
+    # 无抑制：Km + x
+    return Km * log_term + delta
+
+
+def time_to_conversion(L0, E, Km, Ki, conversion, inhibition_type):
+    # 达到目标转化率（%）所需的反应时间（小时）
+    conversion = np.asarray(conversion, dtype=float)
+    if np.any((conversion <= 0) | (conversion >= 100)):
+        raise ValueError("目标转化率必须在 0~100% 之间（不含端点）")
+    L0 = np.asarray(L0, dtype=float)
+    L_target = L0 * (1 - conversion / 100)
+    return conversion_integral(L0, L_target, Km, Ki, inhibition_type) / (np.asarray(E, dtype=float) * 60)
+
+
+def conversion_at_time(L0, E, Km, Ki, t_hours, inhibition_type, iterations=60):
+    # time_to_conversion 的反函数：向量化二分法求给定时间下的转化率（%）
+    L0, E, Km, Ki, t_hours = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (L0, E, Km, Ki, t_hours)))
+    target = t_hours * 60 * E
+    low = np.zeros_like(L0)
+    high = np.full_like(L0, 1 - 1e-12)
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        reached = conversion_integral(L0, L0 * (1 - middle), Km, Ki, inhibition_type) >= target
+        high = np.where(reached, middle, high)
+        low = np.where(reached, low, middle)
+    return (low + high) / 2 * 100
+
+
+def optimal_dosing(L0, Km, Ki, inhibition_type, target_conversion=90.0, enzyme_price=0.01,
+                   reactor_hour_cost=50.0, volume_mL=1000.0, E_bounds=(0.001, 10.0), t_max_limit=12.0,
+                   fixed_hours=0.0):
+    # 成本最低的 (E, t_max) 组合
+    # enzyme_price: 酶单价 ($/U)；reactor_hour_cost: 反应器占用成本 ($/小时)；volume_mL: 反应体积 (mL)
+    # E_bounds: 酶浓度上下限 (U/mL)；t_max_limit: 允许的最长反应时间（小时）；fixed_hours: 每批固定辅助时间
+    # 返回字典，各项均为与 L0 广播后形状相同的数组；不可行的组合 feasible 为 False，其余项为 nan
+    if enzyme_price <= 0 or reactor_hour_cost < 0 or volume_mL <= 0:
+        raise ValueError("酶单价与反应体积必须为正数，反应器成本不能为负")
+    # 以 E = 1 U/mL 计的反应时间，实际时间为 time_unit / E
+    time_unit = time_to_conversion(L0, 1.0, Km, Ki, target_conversion, inhibition_type)
+    enzyme_coef = enzyme_price * volume_mL
+    E_unconstrained = np.sqrt(reactor_hour_cost * time_unit / enzyme_coef)
+    E_low = np.maximum(E_bounds[0], time_unit / t_max_limit)
+    E_high = np.full_like(E_low, E_bounds[1])
+    feasible = E_low <= E_high
+    E = np.where(feasible, np.clip(E_unconstrained, E_low, E_high), np.nan)
+    t_hours = time_unit / E
+    enzyme_cost = enzyme_coef * E
+    reactor_cost = reactor_hour_cost * (t_hours + fixed_hours)
+    return {
+        "E": E,
+        "t_max": t_hours,
+        "enzyme_cost": enzyme_cost,
+        "reactor_cost": reactor_cost,
+        "total_cost": enzyme_cost + reactor_cost,
+        "feasible": feasible
+    }
+
+
+def pareto_front(L0_values, Km, Ki, inhibition_type, target_conversion=90.0, enzyme_price=0.01,
+                 reactor_hour_cost=50.0, volume_mL=1000.0, E_grid=None, t_max_limit=12.0, fixed_hours=0.0):
+    # 酶成本与反应时间的权衡曲线：对每个 L0 与 E_grid 中的每个剂量一次性计算
+    # 由于 t 随 E 单调下降，曲线上每个可行点都是帕累托最优点
+    # 返回字典：L0 (n,)、E (m,)、t_max/enzyme_cost/total_cost (n, m)、feasible (n, m) 以及每个 L0 的最优解
+    if E_grid is None:
+        E_grid = np.geomspace(0.001, 10.0, 200)
+    L0_values = np.atleast_1d(np.asarray(L0_values, dtype=float))
+    E_grid = np.asarray(E_grid, dtype=float)
+    time_unit = time_to_conversion(L0_values, 1.0, Km, Ki, target_conversion, inhibition_type)
+    t_hours = time_unit[:, None] / E_grid[None, :]
+    enzyme_cost = np.broadcast_to(enzyme_price * volume_mL * E_grid, t_hours.shape)
+    total_cost = enzyme_cost + reactor_hour_cost * (t_hours + fixed_hours)
+    optimum = optimal_dosing(L0_values, Km, Ki, inhibition_type, target_conversion, enzyme_price,
+                             reactor_hour_cost, volume_mL, (E_grid.min(), E_grid.max()), t_max_limit,
+                             fixed_hours)
+    return {
+        "L0": L0_values,
+        "E": E_grid,
+        "t_max": t_hours,
+        "enzyme_cost": enzyme_cost,
+        "total_cost": total_cost,
+        "feasible": t_hours <= t_max_limit,
+        "optimum": optimum
+    }
+
+
+def verify_dosing(L0, E, Km, Ki, t_max, inhibition_type, steps=200):
+    # 用数值求解器复核某一 (E, t_max) 组合的最终转化率（%）
+    t_hour, L, Gal, rates = simulate(L0, E, Km, Ki, t_max, steps, inhibition_type)
+    return (1 - L[-1] / L0) * 100
@@ -0,0 +1,87 @@
+# 导入耗时报告：在全新的子进程中用 python -X importtime 导入各模块，统计冷启动开销
+# 用法：python import_report.py                  # 页面启动时导入的模块 + 按需导入的重型依赖
+#       python import_report.py scipy.integrate  # 指定模块
+#       python import_report.py --top 30          # 每个模块列出耗时最多的 30 个子模块
+#
+# “累计耗时”为在该子进程中导入目标模块（含其依赖）的总时间；模块之间共享的依赖分别计入。
+
+import argparse
+import os
+import subprocess
+import sys
+
+# 页面脚本启动时直接导入的模块
+STARTUP_MODULES = [
+    "streamlit",
+    "numpy",
+    "static_content",
+    "lactose_model",
+    "job_queue",
+    "run_store",
+    "dosing_optimizer",
+    "compact_results"
+]
+
+# 在首次使用时才导入的重型依赖
+DEFERRED_MODULES = [
+    "scipy.integrate",
+    "matplotlib.pyplot",
+    "pandas",
+    "openpyxl"
+]
+
+# 启动阶段不应被间接导入的模块
+HEAVY_MODULES = ("scipy", "matplotlib", "pandas", "openpyxl")
+
+
+def measure(module):
+    # 返回 (总耗时微秒, [(累计微秒, 自身微秒, 模块名), ...])，按累计耗时降序；导入失败时抛出 RuntimeError
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=here
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "导入失败")
+    entries = []
+    total = 0
+    for line in result.stderr.splitlines():
+        # 格式：import time: self [us] | cumulative | imported package（包名前的缩进表示嵌套层级）
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if len(name) - len(name.lstrip()) <= 1:
+            total += int(cumulative_us)
+        entries.append((int(cumulative_us), int(self_us), name.strip()))
+    return total, sorted(entries, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模块导入耗时报告")
+    parser.add_argument("modules", nargs="*", help="要测量的模块，默认测量页面启动模块与按需导入的依赖")
+    parser.add_argument("--top", type=int, default=5, help="每个模块列出耗时最多的子模块数")
+    args = parser.parse_args()
+
+    groups = [("", args.modules)] if args.modules else [("启动时导入", STARTUP_MODULES),
+                                                         ("首次使用时导入", DEFERRED_MODULES)]
+    for title, modules in groups:
+        if title:
+            print(f"== {title} ==")
+        for module in modules:
+            try:
+                total, entries = measure(module)
+            except RuntimeError as e:
+                print(f"{module:<22} 导入失败: {e}")
+                continue
+            loaded = {name for _, _, name in entries}
+            heavy = sorted({name.split(".")[0] for name in loaded if name.split(".")[0] in HEAVY_MODULES}
+                           - {module.split(".")[0]})
+            note = f"  [间接导入: {', '.join(heavy)}]" if heavy and title == "启动时导入" else ""
+            print(f"{module:<22} {total / 1000:8.1f} ms  ({len(loaded)} 个模块){note}")
+            for cumulative, self_us, name in entries[1:args.top + 1]:
+                print(f"    {cumulative / 1000:8.1f} ms  {name}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
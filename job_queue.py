@@ -0,0 +1,263 @@
+# 后台任务队列：在本地进程池中运行耗时的求解任务（参数扫描、批量导出等）
+# 每个任务由若干个 simulate 调用组成，页面通过 Job.progress 读取进度，
+# 参数改变时可取消；完成的结果以 CompactResult 形式写入 ResultCache，后续重新运行脚本时直接命中。
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from compact_results import CompactResult
+from lactose_model import cache_key, simulate
+
+# 任务状态
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+def process_context():
+    # 进程池的启动方式：调用方（Streamlit 服务器、HTTP 服务）是多线程进程，fork 会把其他线程持有的锁
+    # 一并复制到子进程中导致死锁，因此改用 forkserver（不支持的平台上用 spawn）
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+class ResultCache:
+    # 线程安全的 LRU 结果缓存，键为 cache_key(...)，值为 CompactResult
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class Job:
+    # 一个后台任务：tasks 为 simulate 的参数元组列表，results 为与之一一对应的 CompactResult
+
+    def __init__(self, job_id, tasks, label="", owner=None):
+        self.id = job_id
+        self.label = label
+        self.owner = owner
+        self.tasks = list(tasks)
+        self.results = [None] * len(self.tasks)
+        self.status = PENDING
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self._completed = 0
+        self._futures = []
+        self._lock = threading.Lock()
+        self._done_event = threading.Event()
+
+    @property
+    def total(self):
+        return len(self.tasks)
+
+    @property
+    def completed(self):
+        return self._completed
+
+    @property
+    def progress(self):
+        # 0~1 之间的进度，供 st.progress 使用
+        if not self.tasks:
+            return 1.0
+        return self._completed / len(self.tasks)
+
+    def is_finished(self):
+        return self.status in (DONE, CANCELLED, FAILED)
+
+    def cancel(self):
+        # 尚未开始的子任务直接取消；正在运行的子任务结束后结果被丢弃
+        with self._lock:
+            if self.is_finished():
+                return False
+            self.status = CANCELLED
+            self.finished = time.time()
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+        self._done_event.set()
+        return True
+
+    def wait(self, timeout=None):
+        return self._done_event.wait(timeout)
+
+    def result(self, timeout=None):
+        if not self.wait(timeout):
+            raise TimeoutError(f"任务 {self.id} 未在规定时间内完成")
+        if self.status == FAILED:
+            raise self.error
+        if self.status == CANCELLED:
+            raise RuntimeError(f"任务 {self.id} 已取消")
+        return self.results
+
+    async def result_async(self, poll_interval=0.05):
+        # asyncio 接口：不阻塞事件循环，轮询直到任务结束
+        while not self.is_finished():
+            await asyncio.sleep(poll_interval)
+        return self.result(timeout=0)
+
+    def _set_result(self, index, value):
+        with self._lock:
+            if self.is_finished():
+                return
+            self.results[index] = value
+            self._completed += 1
+            if self._completed == len(self.tasks):
+                self.status = DONE
+                self.finished = time.time()
+                self._done_event.set()
+
+    def _set_error(self, error):
+        with self._lock:
+            if self.is_finished():
+                return
+            self.status = FAILED
+            self.error = error
+            self.finished = time.time()
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+        self._done_event.set()
+
+
+class JobQueue:
+    # 本地进程池任务队列，max_workers 限制每个服务器进程的并发求解数
+
+    def __init__(self, max_workers=None, cache=None, max_jobs=64):
+        if max_workers is None:
+            max_workers = max(1, min(4, (os.cpu_count() or 1) - 1))
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.cache = cache if cache is not None else ResultCache()
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=process_context())
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, tasks, label="", owner=None):
+        # tasks: [(L0, Vmax, Km, Ki, t_max, steps, inhibition_type), ...]
+        job = Job(f"job-{next(self._ids)}", tasks, label=label, owner=owner)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_jobs()
+
+        if not job.tasks:
+            job.status = DONE
+            job.finished = time.time()
+            job._done_event.set()
+            return job
+
+        job.status = RUNNING
+        for index, task in enumerate(job.tasks):
+            # 提交过程中任务可能已被其他线程取消（例如 cancel_owner），剩余子任务不再提交
+            if job.is_finished():
+                break
+            key = cache_key(*task)
+            cached = self.cache.get(key)
+            if cached is not None:
+                job._set_result(index, cached)
+                continue
+            future = self._executor.submit(simulate, *task)
+            with job._lock:
+                cancelled = job.is_finished()
+                if not cancelled:
+                    job._futures.append(future)
+            if cancelled:
+                future.cancel()
+                break
+            future.add_done_callback(self._make_callback(job, index, key))
+        return job
+
+    def _make_callback(self, job, index, key):
+        def callback(future):
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                job._set_error(error)
+                return
+            value = CompactResult.from_simulation(key[0], future.result())
+            # 即使任务已被取消，已算出的结果仍写入缓存供后续使用
+            self.cache.put(key, value)
+            job._set_result(index, value)
+        return callback
+
+    async def submit_async(self, tasks, label="", owner=None):
+        # asyncio 接口：提交并等待结果
+        job = self.submit(tasks, label=label, owner=owner)
+        return await job.result_async()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner=None):
+        with self._lock:
+            return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        return job.cancel() if job is not None else False
+
+    def cancel_owner(self, owner):
+        # 取消某个会话的全部未完成任务（例如用户修改了参数）
+        return sum(1 for job in self.jobs(owner) if job.cancel())
+
+    def shutdown(self, wait=False):
+        for job in self.jobs():
+            job.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _trim_jobs(self):
+        # 只保留最近的 max_jobs 个任务记录，已结束的优先移除
+        while len(self._jobs) > self.max_jobs:
+            for job_id, job in self._jobs.items():
+                if job.is_finished():
+                    del self._jobs[job_id]
+                    break
+            else:
+                break
+
+
+def sweep_tasks(L0, Vmax, Km, Ki, t_max, steps, param_name, values, inhibition_types):
+    # 构造参数扫描任务：对 param_name 取 values 中的每个值，逐一求解每种抑制类型
+    base = {"L0": L0, "Vmax": Vmax, "Km": Km, "Ki": Ki, "t_max": t_max, "steps": steps}
+    tasks = []
+    for value in values:
+        params = dict(base)
+        params[param_name] = value
+        for inhibition_type in inhibition_types:
+            tasks.append((params["L0"], params["Vmax"], params["Km"], params["Ki"],
+                          params["t_max"], params["steps"], inhibition_type))
+    return tasks
@@ -0,0 +1,86 @@
+# 乳糖水解动力学模型（与界面无关的物理部分）
+# 供 Streamlit 页面、后台任务队列等复用，不依赖 streamlit
+# scipy.integrate 在首次求解时才导入，导入本模块本身很快
+
+import numpy as np
+
+# 内部使用的抑制类型标识符
+INHIBITION_TYPES = ("no_inhibition", "competitive", "non_competitive", "uncompetitive")
+
+
+def cache_key(L0, Vmax, Km, Ki, t_max, steps, inhibition_type):
+    # 浮点参数取整后作为键，避免滑块取值的微小误差导致缓存失效
+    return (round(float(L0), 6), round(float(Vmax), 6), round(float(Km), 6),
+            round(float(Ki), 6), round(float(t_max), 6), int(steps), inhibition_type)
+
+
+def model(L, t, Vmax, Km, Ki, L0, inhibition_type):
+    L = max(L, 1e-6)
+    Gal = L0 - L
+
+    # 根据抑制类型选择不同的动力学方程
+    if inhibition_type == "competitive":
+        denominator = Km * (1 + Gal / Ki) + L
+    elif inhibition_type == "non_competitive":
+        denominator = (Km + L) * (1 + Gal / Ki)
+    elif inhibition_type == "uncompetitive":
+        denominator = Km + L * (1 + Gal / Ki)
+    else:
+        denominator = Km + L  # 无抑制
+
+    dLdt = -Vmax * L / denominator
+    return dLdt
+
+
+# 模拟函数 - 时间单位：输入 t_max 为小时，积分在分钟尺度上进行
+def simulate(L0, Vmax, Km, Ki, t_max, steps, inhibition_type):
+    if L0 <= 0 or Vmax <= 0 or Km <= 0 or Ki <= 0:
+        raise ValueError("参数必须为正数")
+    from scipy.integrate import odeint
+    t_min = np.linspace(0, t_max * 60, steps)
+    sol = odeint(model, L0, t_min, args=(Vmax, Km, Ki, L0, inhibition_type))
+    L = sol[:, 0]
+    Gal = np.maximum(L0 - L, 0)
+    t_hour = t_min / 60
+    rates = np.abs(np.gradient(L, t_hour))
+    return t_hour, L, Gal, rates
+
+
+# 抑制类型在批量求解中的整数编码
+INHIBITION_CODES = {name: code for code, name in enumerate(INHIBITION_TYPES)}
+
+
+def model_batch(L, t, Vmax, Km, Ki, L0, codes):
+    # model 的向量化版本：L 及各参数均为等长数组，codes 为抑制类型编码
+    L = np.maximum(L, 1e-6)
+    Gal = L0 - L
+    inhibition = 1 + Gal / Ki
+    denominator = np.select(
+        [codes == INHIBITION_CODES["competitive"],
+         codes == INHIBITION_CODES["non_competitive"],
+         codes == INHIBITION_CODES["uncompetitive"]],
+        [Km * inhibition + L, (Km + L) * inhibition, Km + L * inhibition],
+        default=Km + L
+    )
+    return -Vmax * L / denominator
+
+
+# 批量模拟：多组参数共享同一时间轴，一次积分完成
+# L0、Vmax、Km、Ki、inhibition_types 可为标量或等长序列；返回的 L、Gal、rates 形状为 (组数, steps)
+def simulate_batch(L0, Vmax, Km, Ki, t_max, steps, inhibition_types):
+    L0, Vmax, Km, Ki = (np.atleast_1d(np.asarray(x, dtype=float)) for x in (L0, Vmax, Km, Ki))
+    if isinstance(inhibition_types, str):
+        inhibition_types = [inhibition_types]
+    codes = np.array([INHIBITION_CODES.get(name, 0) for name in inhibition_types])
+    L0, Vmax, Km, Ki, codes = np.broadcast_arrays(L0, Vmax, Km, Ki, codes)
+    if np.any(L0 <= 0) or np.any(Vmax <= 0) or np.any(Km <= 0) or np.any(Ki <= 0):
+        raise ValueError("参数必须为正数")
+    from scipy.integrate import odeint
+    t_min = np.linspace(0, t_max * 60, steps)
+    # 各组方程互不耦合，雅可比矩阵为对角阵（ml=mu=0），避免 LSODA 构造稠密矩阵
+    sol = odeint(model_batch, L0.copy(), t_min, args=(Vmax, Km, Ki, L0, codes), ml=0, mu=0)
+    L = sol.T
+    Gal = np.maximum(L0[:, None] - L, 0)
+    t_hour = t_min / 60
+    rates = np.abs(np.gradient(L, t_hour, axis=1)) if steps > 1 else np.zeros_like(L)
+    return t_hour, L, Gal, rates
@@ -0,0 +1,537 @@
+# Streamlit 页面的并发会话压力测试（全部在本机运行）
+# 用法：python loadtest_app.py                                  # 使用 loadtest_scenario.json
+#       python loadtest_app.py my_scenario.json --sessions 16 --json result.json
+#
+# 流程：在本机启动一个 `streamlit run` 服务器（无界面），用 N 个模拟浏览器会话通过 WebSocket
+# 连接 /_stcore/stream，按场景文件生成的交互序列修改滑块、多选框并触发脚本重新运行。
+# 会话的交互序列由 seed 与会话编号确定，同一场景在不同版本之间可重复比较。
+#
+# 输出：
+#   - 重新运行延迟（发出请求到收到 script_finished）的 p50/p95/p99
+#   - 服务器进程的 CPU 时间与常驻内存，按会话数平均（所有会话共享同一进程，无法精确拆分）
+#   - 求解缓存效果：页面查询 solve_model 的次数与实际调用 simulate 的次数
+#
+# 仅依赖标准库与 streamlit 自带的 protobuf 消息定义；WebSocket 客户端为最小实现。
+# 控件 id 格式与控件状态的编码方式依赖 Streamlit 内部实现（按 1.66 编写）：低于该版本时拒绝运行
+# （可用 --force 强制运行），且首次运行后找不到场景中的任一控件时立即报错，不会输出无效结果。
+# CPU 与内存统计读取 /proc，仅支持 Linux。
+
+import argparse
+import base64
+import json
+import os
+import platform
+import random
+import re
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from lactose_model import simulate as _original_simulate
+from static_content import TRANSLATIONS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_SCRIPT = os.path.join(HERE, "乳糖水解框架-2.py")
+DEFAULT_SCENARIO = os.path.join(HERE, "loadtest_scenario.json")
+# 编写本脚本时使用的 Streamlit 版本
+TESTED_STREAMLIT = (1, 66)
+
+# 启动服务器的引导代码：在服务器进程中统计 simulate 的实际调用次数后再启动 streamlit
+SERVER_BOOTSTRAP = """
+import sys
+import loadtest_app
+loadtest_app.install_solver_counter(sys.argv.pop(1))
+
+from streamlit.web.cli import main
+sys.argv = ["streamlit"] + sys.argv[1:]
+main()
+"""
+
+_counter = {"path": None, "pid": None, "calls": 0}
+_counter_lock = threading.Lock()
+
+
+def counted_simulate(*args, **kwargs):
+    # 页面中 simulate 的调用次数即 solve_model 缓存未命中次数，写入统计文件
+    # 定义在模块顶层，后台进程池可以按引用序列化；工作进程中的调用（参数扫描）不计入
+    if _counter["pid"] == os.getpid():
+        with _counter_lock:
+            _counter["calls"] += 1
+            with open(_counter["path"], "w") as f:
+                f.write(str(_counter["calls"]))
+    return _original_simulate(*args, **kwargs)
+
+
+def install_solver_counter(stats_path):
+    import lactose_model
+
+    _counter.update(path=stats_path, pid=os.getpid(), calls=0)
+    lactose_model.simulate = counted_simulate
+
+
+class WebSocketClient:
+    # 最小的 RFC 6455 客户端：只支持二进制消息，自动回复 ping
+
+    def __init__(self, host, port, path, subprotocol="streamlit", timeout=120.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            f"Origin: http://{host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            f"Sec-WebSocket-Protocol: {subprotocol}\r\n\r\n"
+        )
+        self.sock.sendall(request.encode())
+        self._buffer = b""
+        while b"\r\n\r\n" not in self._buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("WebSocket 握手失败：连接被关闭")
+            self._buffer += chunk
+        header, self._buffer = self._buffer.split(b"\r\n\r\n", 1)
+        status_line = header.split(b"\r\n", 1)[0].decode(errors="replace")
+        if " 101 " not in status_line + " ":
+            raise ConnectionError(f"WebSocket 握手失败: {status_line}")
+
+    def _send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        self.sock.sendall(header + mask + masked)
+
+    def send(self, payload):
+        self._send_frame(0x2, payload)
+
+    def _recv_exact(self, n):
+        while len(self._buffer) < n:
+            chunk = self.sock.recv(max(65536, n - len(self._buffer)))
+            if not chunk:
+                raise ConnectionError("WebSocket 连接已关闭")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+    def recv(self):
+        message = b""
+        while True:
+            b0, b1 = self._recv_exact(2)
+            opcode = b0 & 0x0F
+            length = b1 & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", self._recv_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", self._recv_exact(8))[0]
+            mask = self._recv_exact(4) if b1 & 0x80 else None
+            payload = self._recv_exact(length)
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            if opcode == 0x9:  # ping
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:  # pong
+                continue
+            if opcode == 0x8:  # close
+                raise ConnectionError("服务器关闭了 WebSocket 连接")
+            message += payload
+            if b0 & 0x80:
+                return message
+
+    def close(self):
+        try:
+            self._send_frame(0x8, b"")
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class BrowserSession:
+    # 模拟一个浏览器标签页：记录页面上带 key 的控件，发送控件状态并触发重新运行
+
+    WIDGET_TYPES = ("slider", "multiselect", "selectbox")
+
+    def __init__(self, host, port, timeout=120.0):
+        from streamlit.proto.Alert_pb2 import Alert
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        self._Alert = Alert
+        self._BackMsg = BackMsg
+        self._ForwardMsg = ForwardMsg
+        self._WidgetState = WidgetState
+        self.ws = WebSocketClient(host, port, "/_stcore/stream", timeout=timeout)
+        self.widget_ids = {}
+        self.widget_states = {}
+        self._cached = {}
+        self.errors = []
+
+    def _track(self, msg):
+        if msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+            return
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        if kind in self.WIDGET_TYPES:
+            widget_id = getattr(element, kind).id
+            # 带 key 的控件 id 形如 "$$ID-<hash>-<key>"
+            parts = widget_id.split("-", 2)
+            if len(parts) == 3 and parts[2] != "None":
+                self.widget_ids[parts[2]] = widget_id
+        elif kind == "exception":
+            self.errors.append(f"{element.exception.type}: {element.exception.message}")
+        elif kind == "alert" and element.alert.format == self._Alert.ERROR:
+            self.errors.append(element.alert.body)
+        else:
+            return
+        if msg.hash:
+            self._cached[msg.hash] = msg
+
+    def rerun(self):
+        # 发送一次重新运行请求，返回 (延迟秒数, 结束状态)
+        back = self._BackMsg()
+        back.rerun_script.query_string = ""
+        back.rerun_script.widget_states.widgets.extend(self.widget_states.values())
+        start = time.perf_counter()
+        self.ws.send(back.SerializeToString())
+        while True:
+            msg = self._ForwardMsg()
+            msg.ParseFromString(self.ws.recv())
+            kind = msg.WhichOneof("type")
+            if kind == "ref_hash":
+                msg = self._cached.get(msg.ref_hash, msg)
+                kind = msg.WhichOneof("type")
+            if kind == "delta":
+                self._track(msg)
+            elif kind == "script_finished":
+                status = self._ForwardMsg.ScriptFinishedStatus.Name(msg.script_finished)
+                if status != "FINISHED_EARLY_FOR_RERUN":
+                    return time.perf_counter() - start, status
+
+    def _state(self, key):
+        # 控件当前不在页面上时抛出 KeyError
+        widget_id = self.widget_ids[key]
+        state = self._WidgetState()
+        state.id = widget_id
+        self.widget_states[widget_id] = state
+        return state
+
+    def set_slider(self, key, value):
+        self._state(key).double_array_value.data[:] = [float(value)]
+
+    def set_multiselect(self, key, values):
+        self._state(key).string_array_value.data[:] = list(values)
+
+    def set_selectbox(self, key, value):
+        self._state(key).string_value = value
+
+    def close(self):
+        self.ws.close()
+
+
+def process_cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    # utime、stime 为第 14、15 个字段（此处已去掉前两个字段）
+    return (int(fields[11]) + int(fields[12])) / ticks
+
+
+def process_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def load_scenario(path):
+    with open(path, encoding="utf-8") as f:
+        scenario = json.load(f)
+    for name in ("sessions", "interactions_per_session", "actions"):
+        if name not in scenario:
+            raise ValueError(f"场景文件缺少字段: {name}")
+    return scenario
+
+
+def build_interactions(scenario, session_index):
+    # 由 seed 与会话编号生成确定的交互序列：[(思考时间, 控件, 取值), ...]
+    rng = random.Random(f"{scenario.get('seed', 0)}-{session_index}")
+    actions = scenario["actions"]
+    weights = [action.get("weight", 1) for action in actions]
+    think_min, think_max = scenario.get("think_time_s", [0.0, 0.0])
+    interactions = []
+    for _ in range(scenario["interactions_per_session"]):
+        action = rng.choices(actions, weights=weights)[0]
+        if "values" in action:
+            value = rng.choice(action["values"])
+        elif "range" in action:
+            value = round(rng.uniform(*action["range"]), action.get("digits", 2))
+        else:
+            value = list(rng.choice(action["choices"]))
+        interactions.append((rng.uniform(think_min, think_max), action["widget"], value))
+    return interactions
+
+
+def check_streamlit_version(force=False):
+    # 返回已安装的 Streamlit 版本字符串；低于 TESTED_STREAMLIT 时退出，较新版本只给出警告
+    from importlib.metadata import version
+
+    installed = version("streamlit")
+    parsed = tuple(int(part) for part in re.findall(r"\d+", installed)[:2])
+    tested = ".".join(map(str, TESTED_STREAMLIT))
+    if parsed < TESTED_STREAMLIT and not force:
+        raise SystemExit(f"Streamlit {installed} 低于本脚本支持的版本 {tested}：控件 id 与消息格式可能不同，"
+                         f"结果不可信。可用 --force 强制运行")
+    if parsed != TESTED_STREAMLIT:
+        print(f"警告: 本脚本按 Streamlit {tested} 编写，当前为 {installed}", file=sys.stderr)
+    return installed
+
+
+def scenario_widget_keys(scenario, lang):
+    # 场景中各交互对应的控件 key
+    keys = {f"inhibition_types_{lang}" if action["widget"] == "inhibition_types" else action["widget"]
+            for action in scenario["actions"]}
+    if lang == "en":
+        keys.add("language")
+    return keys
+
+
+def run_session(host, port, scenario, session_index, start_delay, timeout):
+    # 运行一个会话，返回每次重新运行的延迟、solve_model 查询次数与错误
+    time.sleep(start_delay)
+    lang = "en" if scenario.get("language") == "English" else "zh"
+    t = TRANSLATIONS[lang]
+    # 与页面默认值一致：默认选中全部三种抑制类型
+    selected_types = ["competitive", "non_competitive", "uncompetitive"]
+    session = BrowserSession(host, port, timeout)
+    latencies, statuses = [], []
+    lookups = 0
+    skipped = 0
+
+    def timed_rerun():
+        latency, status = session.rerun()
+        latencies.append(latency)
+        statuses.append(status)
+        # 每次运行查询一次无抑制结果，再加上每个选中的抑制类型
+        return 1 + len(selected_types)
+
+    try:
+        lookups += timed_rerun()
+        if lang == "en" and "language" in session.widget_ids:
+            session.set_selectbox("language", "English")
+            lookups += timed_rerun()
+        # 默认参数下场景中的控件都应出现在页面上；找不到说明控件 id 格式或消息结构与本脚本不兼容
+        missing = sorted(scenario_widget_keys(scenario, lang) - set(session.widget_ids))
+        if missing:
+            raise RuntimeError(f"页面上找不到控件: {', '.join(missing)}（已识别: {', '.join(sorted(session.widget_ids))}）。"
+                               f"请检查 Streamlit 版本是否与本脚本兼容")
+        for think_time, widget, value in build_interactions(scenario, session_index):
+            time.sleep(think_time)
+            try:
+                if widget == "inhibition_types":
+                    session.set_multiselect(f"inhibition_types_{lang}", [t[key] for key in value])
+                    selected_types = value
+                elif widget == "steps":
+                    session.set_slider(widget, int(value))
+                else:
+                    session.set_slider(widget, value)
+            except KeyError:
+                # 控件当前不在页面上（例如未选择抑制类型时没有半乳糖滑块）
+                skipped += 1
+                continue
+            lookups += timed_rerun()
+    finally:
+        session.close()
+    return {
+        "session": session_index,
+        "latencies": latencies,
+        "statuses": statuses,
+        "lookups": lookups,
+        "errors": session.errors,
+        "skipped": skipped
+    }
+
+
+def start_server(port, stats_path, run_store_path, log_path):
+    env = dict(os.environ)
+    env["LACTOSE_RUN_STORE"] = run_store_path
+    command = [
+        sys.executable, "-c", SERVER_BOOTSTRAP, stats_path, "run", APP_SCRIPT,
+        "--server.headless", "true",
+        "--server.address", "127.0.0.1",
+        "--server.port", str(port),
+        "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false"
+    ]
+    # 服务器输出写入日志文件，避免管道写满后服务器阻塞
+    with open(log_path, "wb") as log:
+        server = subprocess.Popen(command, cwd=HERE, env=env, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            with open(log_path, encoding="utf-8", errors="replace") as log:
+                raise RuntimeError(f"服务器启动失败: {log.read()[-2000:]}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("服务器在 60 秒内未能启动")
+
+
+def read_solver_calls(stats_path):
+    try:
+        with open(stats_path) as f:
+            return int(f.read() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def run_load_test(scenario, port=8599, timeout=120.0, force=False):
+    streamlit_version = check_streamlit_version(force)
+    sessions = scenario["sessions"]
+    ramp = scenario.get("ramp_up_s", 0.0)
+    delays = [ramp * i / max(sessions - 1, 1) for i in range(sessions)]
+    workdir = tempfile.mkdtemp(prefix="lactose_loadtest_")
+    stats_path = os.path.join(workdir, "solver_calls")
+    server = start_server(port, stats_path, os.path.join(workdir, "runs.sqlite"), os.path.join(workdir, "server.log"))
+    try:
+        cpu_start = process_cpu_seconds(server.pid)
+        rss_start = process_rss_mb(server.pid)
+        rss_peak = [rss_start]
+        done = threading.Event()
+
+        def sample_rss():
+            while not done.wait(0.5):
+                rss_peak[0] = max(rss_peak[0], process_rss_mb(server.pid))
+
+        sampler = threading.Thread(target=sample_rss, daemon=True)
+        sampler.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            futures = [executor.submit(run_session, "127.0.0.1", port, scenario, i, delays[i], timeout)
+                       for i in range(sessions)]
+            results = [future.result() for future in futures]
+        wall = time.perf_counter() - started
+        done.set()
+        cpu_total = process_cpu_seconds(server.pid) - cpu_start
+        rss_end = process_rss_mb(server.pid)
+        calls = read_solver_calls(stats_path)
+    finally:
+        server.terminate()
+        try:
+            server.wait(10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    latencies = np.array([latency for r in results for latency in r["latencies"]])
+    lookups = sum(r["lookups"] for r in results)
+    if len(latencies):
+        p50, p95, p99 = (float(v) for v in np.percentile(latencies * 1000, [50, 95, 99]))
+    else:
+        p50 = p95 = p99 = float("nan")
+    errors = [e for r in results for e in r["errors"]]
+    return {
+        "scenario": scenario.get("name", ""),
+        "sessions": sessions,
+        "reruns": int(len(latencies)),
+        "wall_s": wall,
+        "latency_ms": {
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "max": float(latencies.max() * 1000) if len(latencies) else float("nan"),
+            "mean": float(latencies.mean() * 1000) if len(latencies) else float("nan")
+        },
+        "server": {
+            "cpu_s": cpu_total,
+            "cpu_s_per_session": cpu_total / sessions,
+            "cpu_ms_per_rerun": cpu_total * 1000 / max(len(latencies), 1),
+            "rss_mb_start": rss_start,
+            "rss_mb_peak": rss_peak[0],
+            "rss_mb_end": rss_end,
+            "rss_mb_per_session": (rss_peak[0] - rss_start) / sessions
+        },
+        "cache": {
+            "solve_lookups": lookups,
+            "solver_calls": calls,
+            "hit_ratio": 1 - calls / lookups if lookups else float("nan")
+        },
+        "incomplete_reruns": sum(status != "FINISHED_SUCCESSFULLY" for r in results for status in r["statuses"]),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "skipped_interactions": sum(r["skipped"] for r in results),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "streamlit": streamlit_version
+        }
+    }
+
+
+def print_report(report):
+    latency = report["latency_ms"]
+    server = report["server"]
+    cache = report["cache"]
+    print(f"场景: {report['scenario']}（{report['sessions']} 个会话）")
+    print(f"重新运行 {report['reruns']} 次，耗时 {report['wall_s']:.1f} s，未正常结束 {report['incomplete_reruns']} 次，"
+          f"跳过交互 {report['skipped_interactions']} 次，页面错误 {report['errors']} 个")
+    print(f"重新运行延迟 (ms): p50 {latency['p50']:.0f}  p95 {latency['p95']:.0f}  "
+          f"p99 {latency['p99']:.0f}  max {latency['max']:.0f}")
+    print(f"服务器 CPU: 共 {server['cpu_s']:.1f} s，每个会话 {server['cpu_s_per_session']:.2f} s，"
+          f"每次重新运行 {server['cpu_ms_per_rerun']:.0f} ms")
+    print(f"服务器内存: 启动 {server['rss_mb_start']:.0f} MB，峰值 {server['rss_mb_peak']:.0f} MB，"
+          f"每个会话约 {server['rss_mb_per_session']:.1f} MB")
+    print(f"求解缓存: 查询 {cache['solve_lookups']} 次，实际求解 {cache['solver_calls']} 次，"
+          f"命中率 {cache['hit_ratio'] * 100:.1f}%")
+    if report["first_error"]:
+        print(f"首个错误: {report['first_error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit 页面并发会话压力测试")
+    parser.add_argument("scenario", nargs="?", default=DEFAULT_SCENARIO, help="场景文件 (JSON)")
+    parser.add_argument("--sessions", type=int, default=None, help="覆盖场景中的会话数")
+    parser.add_argument("--interactions", type=int, default=None, help="覆盖每个会话的交互次数")
+    parser.add_argument("--port", type=int, default=8599, help="测试服务器端口")
+    parser.add_argument("--timeout", type=float, default=120.0, help="单次重新运行的超时时间 (秒)")
+    parser.add_argument("--force", action="store_true", help="Streamlit 版本低于支持版本时仍然运行")
+    parser.add_argument("--json", help="将结果写入 JSON 文件，便于不同版本之间比较")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    if args.sessions is not None:
+        scenario["sessions"] = args.sessions
+    if args.interactions is not None:
+        scenario["interactions_per_session"] = args.interactions
+
+    report = run_load_test(scenario, args.port, args.timeout, args.force)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+# 在线状态估计：根据反应器在线分析仪的乳糖读数跟踪正在进行的批次
+# 扩展卡尔曼滤波（EKF），状态为 [L, ln Vmax, ln Ki]，Km 与 L0 视为已知：
+#   - 时间更新：用 lactose_model.model 的速率方程做 RK4 积分，雅可比矩阵由有限差分得到；
+#     Vmax、Ki 按对数随机游走，可跟踪酶失活等缓慢漂移，取对数保证参数始终为正
+#   - 量测更新：标量卡尔曼更新，新息过大（超过卡方门限）的读数视为异常值丢弃
+# 每个读数的计算量与已有读数个数无关（O(1)），不需要对整批数据重新拟合，可同时跟踪数十个反应器。
+# 剩余时间由 dosing_optimizer.conversion_integral 的闭式解计算，不确定度用一阶误差传播（delta 方法）。
+# 时间单位与页面一致：内部在分钟尺度积分（Vmax 单位 mM/分钟），对外以小时表示。
+#
+# 回放模式：用本地 CSV 代替在线分析仪，列为 reactor_id, time_h, lactose_mM
+#   python online_estimator.py readings.csv --Km 30 --Vmax 1 --Ki 10 --target 90
+#   python online_estimator.py --write-demo demo.csv --reactors 24   # 生成带噪声的示例数据
+
+import argparse
+import csv
+import math
+import time
+
+import numpy as np
+
+from dosing_optimizer import conversion_integral
+from lactose_model import INHIBITION_TYPES, model
+
+# 1 自由度卡方分布 99.9% 分位数，用于异常读数判定
+OUTLIER_GATE = 10.83
+
+
+class ReactorEstimator:
+    # 单个反应器批次的 EKF
+    # L0: 批次初始乳糖浓度 (mM)，决定 Gal = L0 - L；Km: 米氏常数 (mM)；Vmax、Ki: 初始猜测值
+    # t0、L_init: 开始跟踪的时刻（小时）与该时刻的乳糖浓度；中途接入正在进行的批次时 L_init 取第一个读数，
+    #   缺省为 L0（从批次开始跟踪）
+    # measurement_std: 分析仪读数标准差 (mM)；process_std: 乳糖浓度的模型误差 (mM/√小时)
+    # Vmax_drift、Ki_drift: 参数的对数随机游走强度 (1/√小时)；initial_log_std: ln Vmax、ln Ki 的初始标准差
+
+    def __init__(self, L0, Km, Vmax, Ki, inhibition_type="competitive", t0=0.0, L_init=None,
+                 measurement_std=2.0, process_std=1.0, Vmax_drift=0.05, Ki_drift=0.05,
+                 initial_log_std=(0.5, 1.0), max_substep=1.0):
+        if L0 <= 0 or Km <= 0 or Vmax <= 0 or Ki <= 0:
+            raise ValueError("参数必须为正数")
+        if L_init is not None and L_init < 0:
+            raise ValueError("L_init 不能为负数")
+        if inhibition_type not in INHIBITION_TYPES:
+            raise ValueError(f"未知的抑制类型: {inhibition_type}")
+        self.L0 = float(L0)
+        self.Km = float(Km)
+        self.inhibition_type = inhibition_type
+        self.t = float(t0)
+        self.x = np.array([self.L0 if L_init is None else max(float(L_init), 1e-6), math.log(Vmax), math.log(Ki)])
+        self.P = np.diag([measurement_std ** 2, initial_log_std[0] ** 2, initial_log_std[1] ** 2])
+        self.R = measurement_std ** 2
+        self.Q_rate = np.diag([process_std ** 2, Vmax_drift ** 2, Ki_drift ** 2])
+        self.max_substep = max_substep
+        self.samples = 0
+        self.rejected = 0
+        self.last_innovation = 0.0
+
+    @property
+    def L(self):
+        return float(self.x[0])
+
+    @property
+    def Vmax(self):
+        return math.exp(self.x[1])
+
+    @property
+    def Ki(self):
+        return math.exp(self.x[2])
+
+    @property
+    def conversion(self):
+        return max(0.0, (1 - self.L / self.L0) * 100)
+
+    def _propagate(self, x, dt_min):
+        # RK4 积分 L，参数保持不变；子步长不超过 max_substep 分钟
+        L = x[0]
+        Vmax, Ki = math.exp(x[1]), math.exp(x[2])
+        args = (Vmax, self.Km, Ki, self.L0, self.inhibition_type)
+        n = max(1, math.ceil(dt_min / self.max_substep))
+        h = dt_min / n
+        for _ in range(n):
+            k1 = model(L, 0, *args)
+            k2 = model(L + h / 2 * k1, 0, *args)
+            k3 = model(L + h / 2 * k2, 0, *args)
+            k4 = model(L + h * k3, 0, *args)
+            L = max(L + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4), 1e-6)
+        return np.array([L, x[1], x[2]])
+
+    def predict(self, t_hour):
+        # 时间更新：把状态推进到 t_hour（小时）
+        dt_hour = t_hour - self.t
+        if dt_hour <= 0:
+            return
+        dt_min = dt_hour * 60
+        x_new = self._propagate(self.x, dt_min)
+        # 有限差分雅可比矩阵（参数行为单位阵，只需对 L 一行求导）
+        F = np.eye(3)
+        for j, step in enumerate((max(1e-4 * abs(self.x[0]), 1e-6), 1e-6, 1e-6)):
+            shifted = self.x.copy()
+            shifted[j] += step
+            F[0, j] = (self._propagate(shifted, dt_min)[0] - x_new[0]) / step
+        self.x = x_new
+        self.P = F @ self.P @ F.T + self.Q_rate * dt_hour
+        self.t = t_hour
+
+    def update(self, t_hour, L_measured):
+        # 处理一个读数，返回 True 表示已采纳，False 表示作为异常值或过期读数丢弃
+        if t_hour < self.t:
+            self.rejected += 1
+            return False
+        self.predict(t_hour)
+        innovation = L_measured - self.x[0]
+        S = self.P[0, 0] + self.R
+        self.last_innovation = innovation
+        if innovation ** 2 / S > OUTLIER_GATE:
+            self.rejected += 1
+            return False
+        K = self.P[:, 0] / S
+        self.x = self.x + K * innovation
+        self.x[0] = max(self.x[0], 1e-6)
+        # Joseph 形式，保持协方差矩阵对称正定
+        I_KH = np.eye(3)
+        I_KH[:, 0] -= K
+        self.P = I_KH @ self.P @ I_KH.T + np.outer(K, K) * self.R
+        self.samples += 1
+        return True
+
+    def _remaining_hours(self, x, L_target):
+        L = min(x[0], self.L0)
+        if L <= L_target:
+            return 0.0
+        integral = conversion_integral(self.L0, L_target, self.Km, math.exp(x[2]), self.inhibition_type) \
+            - conversion_integral(self.L0, L, self.Km, math.exp(x[2]), self.inhibition_type)
+        return float(integral) / (math.exp(x[1]) * 60)
+
+    def time_to_target(self, conversion=90.0):
+        # 从当前时刻起达到目标转化率（%）的剩余时间及其标准差（小时）
+        if not 0 < conversion < 100:
+            raise ValueError("目标转化率必须在 0~100% 之间（不含端点）")
+        L_target = self.L0 * (1 - conversion / 100)
+        remaining = self._remaining_hours(self.x, L_target)
+        if remaining == 0.0:
+            return 0.0, 0.0
+        gradient = np.zeros(3)
+        for j, step in enumerate((max(1e-4 * self.x[0], 1e-6), 1e-5, 1e-5)):
+            up, down = self.x.copy(), self.x.copy()
+            up[j] += step
+            down[j] -= step
+            gradient[j] = (self._remaining_hours(up, L_target) - self._remaining_hours(down, L_target)) / (2 * step)
+        return remaining, math.sqrt(max(float(gradient @ self.P @ gradient), 0.0))
+
+    def snapshot(self, conversion=90.0):
+        remaining, remaining_std = self.time_to_target(conversion)
+        std = np.sqrt(np.diag(self.P))
+        return {
+            "t_hour": self.t,
+            "L": self.L,
+            "L_std": float(std[0]),
+            "conversion": self.conversion,
+            "Vmax": self.Vmax,
+            "Vmax_std": self.Vmax * float(std[1]),
+            "Ki": self.Ki,
+            "Ki_std": self.Ki * float(std[2]),
+            "remaining_h": remaining,
+            "remaining_std_h": remaining_std,
+            "eta_h": self.t + remaining,
+            "samples": self.samples,
+            "rejected": self.rejected
+        }
+
+
+class ReactorFleet:
+    # 按 reactor_id 管理多个反应器的估计器；首次收到某反应器的读数时自动创建，状态由该读数初始化
+    # defaults 为 ReactorEstimator 的参数（L0 除外）；L0 为所有反应器共用的批次初始浓度，
+    # 未给出时只有第一个读数在 t = 0（批次开始）才将其作为 L0，中途接入的批次必须给出 L0 或调用 start_batch
+
+    def __init__(self, L0=None, **defaults):
+        self.L0 = L0
+        self.defaults = defaults
+        self.reactors = {}
+
+    def update(self, reactor_id, t_hour, L_measured):
+        estimator = self.reactors.get(reactor_id)
+        if estimator is None:
+            L0 = self.L0
+            if L0 is None:
+                if t_hour > 0:
+                    raise ValueError(f"反应器 {reactor_id} 的第一个读数在 t = {t_hour:g} h（批次已在进行中），"
+                                     f"需要给出批次初始乳糖浓度 L0")
+                L0 = L_measured
+            estimator = ReactorEstimator(L0, t0=t_hour, L_init=L_measured, **self.defaults)
+            self.reactors[reactor_id] = estimator
+        return estimator.update(t_hour, L_measured)
+
+    def start_batch(self, reactor_id, L0, t_hour=0.0, L_init=None, **overrides):
+        # 新批次开始（或中途接入）：丢弃旧的估计，重新初始化
+        params = dict(self.defaults)
+        params.update(overrides)
+        self.reactors[reactor_id] = ReactorEstimator(L0, t0=t_hour, L_init=L_init, **params)
+        return self.reactors[reactor_id]
+
+    def snapshots(self, conversion=90.0):
+        return {reactor_id: estimator.snapshot(conversion) for reactor_id, estimator in self.reactors.items()}
+
+
+def read_measurements(path):
+    # 逐行读取 CSV：(reactor_id, time_h, lactose_mM)，按文件顺序产出，模拟读数到达顺序
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield row["reactor_id"], float(row["time_h"]), float(row["lactose_mM"])
+
+
+def write_demo_csv(path, reactors=12, L0=200.0, Km=30.0, Ki=10.0, inhibition_type="competitive",
+                   t_max=3.0, interval_min=5.0, noise_std=2.0, seed=0, start_h=0.0):
+    # 生成示例数据：各反应器酶活性不同，读数带高斯噪声，并混入少量异常读数
+    # start_h > 0 时只写出该时刻之后的读数，模拟中途接入正在进行的批次；返回 {reactor_id: 真实 Vmax}
+    from lactose_model import simulate_batch
+
+    rng = np.random.default_rng(seed)
+    steps = int(t_max * 60 / interval_min) + 1
+    Vmax = rng.uniform(0.5, 2.0, reactors)
+    t_hour, L, _, _ = simulate_batch(L0, Vmax, Km, Ki, t_max, steps, [inhibition_type])
+    readings = L + rng.normal(0, noise_std, L.shape)
+    outliers = rng.random(L.shape) < 0.01
+    readings[outliers] += rng.choice([-1, 1], outliers.sum()) * 40
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["reactor_id", "time_h", "lactose_mM"])
+        # 按时间交错写出各反应器的读数
+        for i in range(steps):
+            if t_hour[i] < start_h - 1e-9:
+                continue
+            for r in range(reactors):
+                writer.writerow([f"R{r + 1:02d}", round(float(t_hour[i]), 4), round(max(float(readings[r, i]), 0.0), 3)])
+    return dict(zip((f"R{r + 1:02d}" for r in range(reactors)), Vmax.tolist()))
+
+
+def replay(path, fleet, target=90.0, speed=0.0, every=1, quiet=False):
+    # 回放 CSV：speed > 0 时按读数时间间隔 / speed 等待（speed=60 表示 1 分钟读数间隔回放为 1 秒）
+    previous_t = None
+    count = 0
+    busy = 0.0
+    for reactor_id, t_hour, L_measured in read_measurements(path):
+        if speed > 0 and previous_t is not None and t_hour > previous_t:
+            time.sleep((t_hour - previous_t) * 3600 / speed)
+        previous_t = t_hour
+        start = time.perf_counter()
+        accepted = fleet.update(reactor_id, t_hour, L_measured)
+        estimator = fleet.reactors[reactor_id]
+        remaining, remaining_std = estimator.time_to_target(target)
+        busy += time.perf_counter() - start
+        count += 1
+        if not quiet and count % every == 0:
+            flag = "" if accepted else "  [丢弃]"
+            print(f"{reactor_id:>6} t={t_hour:6.2f} h  读数 {L_measured:7.2f}  估计 {estimator.L:7.2f} mM  "
+                  f"Vmax {estimator.Vmax:6.3f}  Ki {estimator.Ki:7.2f}  "
+                  f"剩余 {remaining:5.2f} ± {remaining_std:4.2f} h{flag}")
+    return count, busy
+
+
+def print_summary(fleet, target):
+    print(f"\n{'反应器':>6} {'读数':>5} {'丢弃':>4} {'转化率%':>8} {'Vmax':>14} {'Ki':>15} {'预计完成 (h)':>16}")
+    for reactor_id, s in sorted(fleet.snapshots(target).items()):
+        print(f"{reactor_id:>6} {s['samples']:>5} {s['rejected']:>4} {s['conversion']:8.1f} "
+              f"{s['Vmax']:7.3f}±{s['Vmax_std']:5.3f} {s['Ki']:7.2f}±{s['Ki_std']:6.2f} "
+              f"{s['eta_h']:8.2f}±{s['remaining_std_h']:5.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="反应器在线状态估计与完成时间预测（CSV 回放）")
+    parser.add_argument("csv", nargs="?", help="读数文件，列为 reactor_id, time_h, lactose_mM")
+    parser.add_argument("--Km", type=float, default=30.0, help="米氏常数 (mM)")
+    parser.add_argument("--Vmax", type=float, default=1.0, help="Vmax 初始猜测 (mM/分钟)")
+    parser.add_argument("--Ki", type=float, default=10.0, help="Ki 初始猜测 (mM)")
+    parser.add_argument("--L0", type=float, default=None,
+                        help="批次初始乳糖浓度 (mM)；省略时各反应器的第一个读数必须在 t = 0，并以其作为 L0")
+    parser.add_argument("--inhibition", default="competitive", choices=INHIBITION_TYPES, help="抑制类型")
+    parser.add_argument("--target", type=float, default=90.0, help="目标转化率 (%%)")
+    parser.add_argument("--measurement-std", type=float, default=2.0, help="分析仪读数标准差 (mM)")
+    parser.add_argument("--speed", type=float, default=0.0, help="回放速度倍数，0 表示不等待")
+    parser.add_argument("--every", type=int, default=1, help="每处理多少个读数输出一行")
+    parser.add_argument("--quiet", action="store_true", help="只输出最终汇总")
+    parser.add_argument("--write-demo", metavar="PATH", help="生成示例读数文件后退出")
+    parser.add_argument("--reactors", type=int, default=12, help="示例数据中的反应器数量")
+    args = parser.parse_args()
+
+    if args.write_demo:
+        true_Vmax = write_demo_csv(args.write_demo, reactors=args.reactors, Km=args.Km, Ki=args.Ki,
+                                   inhibition_type=args.inhibition, noise_std=args.measurement_std)
+        print(f"已写入 {args.write_demo}，各反应器真实 Vmax:")
+        for reactor_id, Vmax in true_Vmax.items():
+            print(f"  {reactor_id}: {Vmax:.3f}")
+        return
+    if not args.csv:
+        parser.error("需要读数文件（或使用 --write-demo 生成示例数据）")
+
+    fleet = ReactorFleet(L0=args.L0, Km=args.Km, Vmax=args.Vmax, Ki=args.Ki,
+                         inhibition_type=args.inhibition, measurement_std=args.measurement_std)
+    try:
+        count, busy = replay(args.csv, fleet, args.target, args.speed, args.every, args.quiet)
+    except ValueError as e:
+        parser.error(str(e))
+    print_summary(fleet, args.target)
+    if count:
+        print(f"\n共处理 {count} 个读数（{len(fleet.reactors)} 个反应器），"
+              f"平均每个读数 {busy / count * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# 模拟结果的本地持久化存储（SQLite 单文件）
+# 每条记录包含参数、抑制类型、汇总指标以及压缩后的轨迹。
+# 汇总指标单独成列并建立索引，例如“Ki < 5 且转化率 > 90% 的全部模拟”只读取索引和汇总列，
+# 不解压轨迹，也不重新计算。
+
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    inhibition_type TEXT NOT NULL,
+    L0 REAL NOT NULL,
+    Vmax REAL NOT NULL,
+    Km REAL NOT NULL,
+    Ki REAL NOT NULL,
+    t_max REAL NOT NULL,
+    steps INTEGER NOT NULL,
+    final_lactose REAL NOT NULL,
+    final_galactose REAL NOT NULL,
+    conversion REAL NOT NULL,
+    max_rate REAL NOT NULL,
+    max_rate_time REAL NOT NULL,
+    trajectory BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_params ON runs (inhibition_type, Ki, Km, Vmax, L0);
+CREATE INDEX IF NOT EXISTS idx_runs_ki_conversion ON runs (Ki, conversion);
+CREATE INDEX IF NOT EXISTS idx_runs_km_conversion ON runs (Km, conversion);
+CREATE INDEX IF NOT EXISTS idx_runs_conversion ON runs (conversion);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at);
+"""
+
+# 可用于 query 过滤的列（参数与汇总指标）
+PARAM_COLUMNS = ("L0", "Vmax", "Km", "Ki", "t_max", "steps")
+METRIC_COLUMNS = ("final_lactose", "final_galactose", "conversion", "max_rate", "max_rate_time")
+SUMMARY_COLUMNS = ("id", "created_at", "label", "inhibition_type") + PARAM_COLUMNS + METRIC_COLUMNS
+
+
+def summarize(L0, result):
+    # 由 simulate 的返回值计算汇总指标
+    t_hour, L, Gal, rates = result
+    max_rate_idx = int(np.argmax(rates))
+    return {
+        "final_lactose": float(L[-1]),
+        "final_galactose": float(Gal[-1]),
+        "conversion": float((1 - L[-1] / L0) * 100),
+        "max_rate": float(rates[max_rate_idx]),
+        "max_rate_time": float(t_hour[max_rate_idx])
+    }
+
+
+def pack_trajectory(result):
+    # 只保存 L 与 rates（float32 + zlib），时间轴由 t_max、steps 重建，Gal 由 L0 - L 得到
+    t_hour, L, Gal, rates = result
+    data = np.stack([np.asarray(L), np.asarray(rates)]).astype("<f4")
+    return zlib.compress(data.tobytes(), 6)
+
+
+def unpack_trajectory(blob, L0, t_max, steps):
+    data = np.frombuffer(zlib.decompress(blob), dtype="<f4").reshape(2, steps)
+    L = data[0].astype(float)
+    rates = data[1].astype(float)
+    t_hour = np.linspace(0, t_max * 60, steps) / 60
+    Gal = np.maximum(L0 - L, 0)
+    return t_hour, L, Gal, rates
+
+
+class RunStore:
+    # path 为 SQLite 文件路径；每次操作使用独立连接，可在 Streamlit 多个会话线程中共享
+
+    def __init__(self, path="runs.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # 退出时提交事务并关闭连接
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _row(self, L0, Vmax, Km, Ki, t_max, steps, inhibition_type, result, label, created_at):
+        metrics = summarize(L0, result)
+        return (created_at, label, inhibition_type, float(L0), float(Vmax), float(Km), float(Ki),
+                float(t_max), int(steps), metrics["final_lactose"], metrics["final_galactose"],
+                metrics["conversion"], metrics["max_rate"], metrics["max_rate_time"],
+                pack_trajectory(result))
+
+    def add_run(self, L0, Vmax, Km, Ki, t_max, steps, inhibition_type, result, label=""):
+        row = self._row(L0, Vmax, Km, Ki, t_max, steps, inhibition_type, result, label, time.time())
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(self._insert_sql(), row)
+            return cursor.lastrowid
+
+    def add_runs(self, runs, label=""):
+        # 批量写入：runs 为 ((L0, Vmax, Km, Ki, t_max, steps, inhibition_type), result) 序列，单个事务完成
+        created_at = time.time()
+        rows = [self._row(*task, result, label, created_at) for task, result in runs]
+        with self._lock, self._connect() as conn:
+            conn.executemany(self._insert_sql(), rows)
+        return len(rows)
+
+    @staticmethod
+    def _insert_sql():
+        columns = SUMMARY_COLUMNS[1:] + ("trajectory",)
+        return (f"INSERT INTO runs ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})")
+
+    def query(self, inhibition_types=None, label=None, limit=500, order_by="created_at DESC", **ranges):
+        # 只读取汇总列，不读取轨迹
+        # ranges 形如 Ki_max=5、conversion_min=90（闭区间），列名见 PARAM_COLUMNS 与 METRIC_COLUMNS
+        # order_by=None 时不排序
+        sql, args = self._query_sql(inhibition_types, label, limit, order_by, ranges)
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, args)]
+
+    def explain_query(self, inhibition_types=None, label=None, limit=500, order_by="created_at DESC", **ranges):
+        # 返回 query 的 EXPLAIN QUERY PLAN 描述，用于确认过滤条件走索引
+        sql, args = self._query_sql(inhibition_types, label, limit, order_by, ranges)
+        with self._connect() as conn:
+            return [row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, args)]
+
+    @staticmethod
+    def _query_sql(inhibition_types, label, limit, order_by, ranges):
+        clauses, args = [], []
+        if inhibition_types:
+            clauses.append(f"inhibition_type IN ({', '.join('?' for _ in inhibition_types)})")
+            args.extend(inhibition_types)
+        if label is not None:
+            clauses.append("label = ?")
+            args.append(label)
+        for name, value in ranges.items():
+            if value is None:
+                continue
+            column, _, bound = name.rpartition("_")
+            if column not in PARAM_COLUMNS + METRIC_COLUMNS or bound not in ("min", "max"):
+                raise ValueError(f"不支持的过滤条件: {name}")
+            clauses.append(f"{column} {'>=' if bound == 'min' else '<='} ?")
+            args.append(value)
+        order = ""
+        if order_by:
+            order_column = order_by.split()[0]
+            if order_column not in SUMMARY_COLUMNS:
+                raise ValueError(f"不支持的排序列: {order_by}")
+            order = f" ORDER BY {order_column} {'ASC' if order_by.upper().endswith('ASC') else 'DESC'}"
+        sql = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM runs"
+        if clauses:
+            where = " AND ".join(clauses)
+            if order:
+                # 先在子查询中按索引筛选出 id，再对结果排序；
+                # 直接 WHERE ... ORDER BY created_at 时 SQLite 会沿 idx_runs_created 扫描全表
+                sql += f" WHERE id IN (SELECT id FROM runs WHERE {where})"
+            else:
+                sql += f" WHERE {where}"
+        sql += order + " LIMIT ?"
+        args.append(int(limit))
+        return sql, args
+
+    def load(self, run_id):
+        # 返回 (汇总信息字典, (t_hour, L, Gal, rates))；不存在时返回 None
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {', '.join(SUMMARY_COLUMNS)}, trajectory FROM runs WHERE id = ?",
+                               (run_id,)).fetchone()
+        if row is None:
+            return None
+        summary = {name: row[name] for name in SUMMARY_COLUMNS}
+        return summary, unpack_trajectory(row["trajectory"], row["L0"], row["t_max"], row["steps"])
+
+    def delete(self, run_ids):
+        run_ids = list(run_ids)
+        if not run_ids:
+            return 0
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(f"DELETE FROM runs WHERE id IN ({', '.join('?' for _ in run_ids)})", run_ids)
+            return cursor.rowcount
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
@@ -0,0 +1,129 @@
+# sim_service.py 的压力测试脚本（仅依赖标准库与 numpy）
+# 用法：python sim_loadgen.py --url http://127.0.0.1:8765 --concurrency 32 --requests 2000
+#
+# 以固定并发数向 /solve 发送随机参数请求，其中 --duplicate-ratio 比例的请求从少量“热点”参数中抽取，
+# 用于观察请求合并与去重的效果。结束后输出吞吐量、延迟分位数及服务端的合并统计。
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+from lactose_model import INHIBITION_TYPES
+
+
+def random_params(rng, t_max, steps):
+    return {
+        "L0": round(rng.uniform(10, 500), 1),
+        "E": round(rng.uniform(0.1, 10), 3),
+        "Km": round(rng.uniform(1, 50), 1),
+        "Ki": round(rng.uniform(1, 50), 1),
+        "t_max": t_max,
+        "steps": steps,
+        "inhibition_type": rng.choice(INHIBITION_TYPES)
+    }
+
+
+def post_json(url, payload, timeout):
+    data = json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def get_json(url, timeout):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def run_load(url, concurrency, total_requests, batch_size, output_format, duplicate_ratio,
+             t_max, steps, seed, timeout):
+    rng = random.Random(seed)
+    hot_params = [random_params(rng, t_max, steps) for _ in range(8)]
+    payloads = []
+    for _ in range(total_requests):
+        batch = [rng.choice(hot_params) if rng.random() < duplicate_ratio else random_params(rng, t_max, steps)
+                 for _ in range(batch_size)]
+        payloads.append({"batch": batch, "format": output_format})
+
+    latencies = []
+    errors = []
+    response_bytes = [0]
+    lock = threading.Lock()
+    next_index = [0]
+
+    def worker():
+        while True:
+            with lock:
+                index = next_index[0]
+                next_index[0] += 1
+            if index >= len(payloads):
+                return
+            start = time.perf_counter()
+            try:
+                body = post_json(url + "/solve", payloads[index], timeout)
+            except (urllib.error.URLError, OSError) as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                response_bytes[0] += len(body)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    return np.array(latencies), errors, response_bytes[0], wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="乳糖水解模拟服务压力测试")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发客户端数")
+    parser.add_argument("--requests", type=int, default=1000, help="请求总数")
+    parser.add_argument("--batch-size", type=int, default=1, help="每个请求包含的参数组数")
+    parser.add_argument("--format", choices=["json", "binary"], default="binary")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3, help="重复参数请求所占比例")
+    parser.add_argument("--t-max", type=float, default=1.0)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/")
+    before = get_json(url + "/health", args.timeout)
+    latencies, errors, total_bytes, wall = run_load(
+        url, args.concurrency, args.requests, args.batch_size, args.format, args.duplicate_ratio,
+        args.t_max, args.steps, args.seed, args.timeout
+    )
+    after = get_json(url + "/health", args.timeout)
+
+    print(f"请求数: {len(latencies)} 成功 / {len(errors)} 失败，耗时 {wall:.2f} s")
+    if len(latencies):
+        runs = len(latencies) * args.batch_size
+        print(f"吞吐量: {len(latencies) / wall:.1f} 请求/s，{runs / wall:.1f} 次模拟/s")
+        p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+        print(f"延迟 (ms): p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}  max {latencies.max() * 1000:.1f}")
+        print(f"平均响应大小: {total_bytes / len(latencies) / 1024:.1f} KiB")
+    merged = after["requests"] - before["requests"]
+    unique = after["unique"] - before["unique"]
+    batches = after["batches"] - before["batches"]
+    if batches:
+        print(f"服务端: {merged} 组参数 -> 去重后 {unique} 组，合并为 {batches} 次批量求解"
+              f"（平均每批 {unique / batches:.1f} 组）")
+    if errors:
+        print(f"首个错误: {errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
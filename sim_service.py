@@ -0,0 +1,384 @@
+# 乳糖水解模拟 HTTP/JSON 服务（仅依赖标准库与 numpy/scipy）
+# 用法：python sim_service.py --port 8765 --workers 4 --window-ms 5
+#
+# 接口：
+#   GET  /health  -> {"status": "ok", ...}
+#   POST /solve   请求体：
+#       {"params": {"L0": 200, "E": 1.0, "Km": 30, "Ki": 10, "t_max": 1, "steps": 200,
+#                   "inhibition_type": "competitive"},
+#        "format": "json"}
+#   或  {"batch": [{...}, {...}], "format": "binary"}
+#   参数缺省值与页面滑块默认值一致，E 也可写作 Vmax。
+#
+# 返回（format=json）：{"t": [...], "runs": [{"L": [...], "rates": [...], "conversion": 95.1}, ...]}
+#   半乳糖浓度不单独返回，按 Gal = L0 - L 计算。
+#   各组参数的 t_max 或 steps 不同时，顶层 "t" 为 null，每组结果各自带 "t"。
+# 返回（format=binary，Content-Type: application/octet-stream，小端序）：
+#   b"LHK1" | uint32 组数 n | uint32 点数 m | float32 t[m] | 每组依次 float32 L[m]、float32 rates[m]
+#   同一请求中的各组参数必须使用相同的 t_max 与 steps。
+#
+# 短时间窗口（--window-ms）内到达的并发请求会被合并为一次向量化批量求解，
+# 相同参数只计算一次；最近求解过的参数保存在 LRU 缓存中（--cache-entries），跨窗口重复的请求直接返回。
+# 求解在常驻的进程池中进行。工作进程异常退出时进程池会自动重建，
+# /health 中的 status 变为 "degraded" 并给出 last_error。
+
+import argparse
+import json
+import math
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from job_queue import ResultCache, process_context
+from lactose_model import INHIBITION_TYPES, cache_key, simulate_batch
+
+# 与页面滑块默认值一致
+DEFAULT_PARAMS = {
+    "L0": 200.0,
+    "E": 1.0,
+    "Km": 30.0,
+    "Ki": 10.0,
+    "t_max": 1.0,
+    "steps": 200,
+    "inhibition_type": "competitive"
+}
+MAX_STEPS = 5000
+MAX_T_MAX = 48.0
+MAX_REQUEST_RUNS = 1000
+BINARY_MAGIC = b"LHK1"
+
+
+def parse_params(raw):
+    # 将请求中的一组参数转换为 simulate 参数元组，非法输入抛出 ValueError
+    if not isinstance(raw, dict):
+        raise ValueError("params 必须为 JSON 对象")
+    params = dict(DEFAULT_PARAMS)
+    params.update(raw)
+    if "Vmax" in raw and "E" not in raw:
+        params["E"] = raw["Vmax"]
+    try:
+        values = [float(params[name]) for name in ("L0", "E", "Km", "Ki", "t_max", "steps")]
+    except (TypeError, ValueError):
+        raise ValueError("参数必须为数值")
+    # json.loads 接受 NaN 与 Infinity
+    if not all(math.isfinite(value) for value in values):
+        raise ValueError("参数必须为有限数值")
+    inhibition_type = params["inhibition_type"]
+    if inhibition_type not in INHIBITION_TYPES:
+        raise ValueError(f"未知的抑制类型: {inhibition_type}")
+    if not values[5].is_integer():
+        raise ValueError("steps 必须为整数")
+    key = cache_key(*values[:5], int(values[5]), inhibition_type)
+    validate_key(key)
+    return key
+
+
+def validate_key(key):
+    # 校验取整后的参数（cache_key 保留 6 位小数，例如 E = 1e-7 会变为 0）
+    L0, Vmax, Km, Ki, t_max, steps, _ = key
+    if L0 <= 0 or Vmax <= 0 or Km <= 0 or Ki <= 0:
+        raise ValueError("参数必须为正数（保留 6 位小数后）")
+    if not 0 < t_max <= MAX_T_MAX or not 2 <= steps <= MAX_STEPS:
+        raise ValueError(f"t_max 必须在 0~{MAX_T_MAX:g} 小时之间，steps 必须在 2~{MAX_STEPS} 之间")
+
+
+def _warm_up():
+    # 进程池预热：提前导入 scipy 并完成一次求解
+    simulate_batch(1.0, 1.0, 1.0, 1.0, 0.1, 2, "no_inhibition")
+    return os.getpid()
+
+
+def _solve_group(keys):
+    # 在工作进程中求解 t_max、steps 相同的一组参数
+    L0, Vmax, Km, Ki, t_max, steps, types = zip(*keys)
+    t_hour, L, Gal, rates = simulate_batch(L0, Vmax, Km, Ki, t_max[0], steps[0], types)
+    return t_hour.astype(np.float32), L.astype(np.float32), rates.astype(np.float32)
+
+
+class MicroBatcher:
+    # 请求合并器：收集 window 秒内到达的参数，去重后按时间轴分组批量求解
+    # make_executor 用于创建（以及在工作进程崩溃后重建）进程池；cache_entries 为已求解结果的 LRU 容量
+
+    def __init__(self, make_executor, window=0.005, max_batch=256, cache_entries=1024):
+        self.make_executor = make_executor
+        self.executor = make_executor()
+        self.window = window
+        self.max_batch = max_batch
+        self.cache = ResultCache(cache_entries)
+        self.stats = {"requests": 0, "unique": 0, "cache_hits": 0, "batches": 0, "rejected": 0, "failed": 0,
+                      "pool_restarts": 0}
+        self.last_error = None
+        self._broken = False
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, key):
+        # 返回 Future，结果为 (t, L, rates) 三个 float32 数组
+        future = Future()
+        self._queue.put((key, future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._dispatch(pending)
+            except Exception as e:
+                # 分发失败（例如进程池已损坏）时让本批请求立即失败，并在下一批之前重建进程池
+                self._record_error(e)
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _record_error(self, error):
+        print(f"[micro-batcher] 求解失败: {error!r}", file=sys.stderr)
+        with self._stats_lock:
+            self.stats["failed"] += 1
+            self.last_error = repr(error)
+            if isinstance(error, BrokenProcessPool):
+                self._broken = True
+
+    def _restart_pool(self):
+        old = self.executor
+        self.executor = self.make_executor()
+        old.shutdown(wait=False, cancel_futures=True)
+        with self._stats_lock:
+            self._broken = False
+            self.stats["pool_restarts"] += 1
+
+    @property
+    def healthy(self):
+        return self._thread.is_alive() and not self._broken
+
+    def _dispatch(self, pending):
+        if self._broken:
+            self._restart_pool()
+        # 逐个校验后再分组，避免一组非法参数导致同批的其他请求失败；
+        # 之前窗口中已求解的参数直接由缓存返回，其余相同参数只保留一份
+        waiters = {}
+        rejected = 0
+        cache_hits = 0
+        for key, future in pending:
+            try:
+                validate_key(key)
+            except ValueError as e:
+                future.set_exception(e)
+                rejected += 1
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                future.set_result(cached)
+                cache_hits += 1
+                continue
+            waiters.setdefault(key, []).append(future)
+        groups = {}
+        for key in waiters:
+            groups.setdefault((key[4], key[5]), []).append(key)
+        with self._stats_lock:
+            self.stats["requests"] += len(pending)
+            self.stats["rejected"] += rejected
+            self.stats["cache_hits"] += cache_hits
+            self.stats["unique"] += len(waiters)
+            self.stats["batches"] += len(groups)
+        for keys in groups.values():
+            try:
+                group_future = self.executor.submit(_solve_group, keys)
+            except BrokenProcessPool as e:
+                # 工作进程已崩溃：重建进程池后重试一次
+                self._record_error(e)
+                self._restart_pool()
+                group_future = self.executor.submit(_solve_group, keys)
+            group_future.add_done_callback(self._make_callback(keys, waiters))
+
+    def _make_callback(self, keys, waiters):
+        def callback(group_future):
+            error = group_future.exception()
+            if error is not None:
+                self._record_error(error)
+                for key in keys:
+                    for future in waiters[key]:
+                        future.set_exception(error)
+                return
+            t_hour, L, rates = group_future.result()
+            # 缓存中的结果会被后续请求共享，设为只读；逐行复制，避免缓存一条结果时保留整组数组
+            t_hour.flags.writeable = False
+            for i, key in enumerate(keys):
+                result = (t_hour, L[i].copy(), rates[i].copy())
+                for array in result[1:]:
+                    array.flags.writeable = False
+                self.cache.put(key, result)
+                for future in waiters[key]:
+                    future.set_result(result)
+        return callback
+
+
+def encode_json(keys, results):
+    # 所有组时间轴相同时只在顶层返回一次 "t"，否则每组各带 "t"
+    shared_axis = len({(key[4], key[5]) for key in keys}) <= 1
+    runs = []
+    for key, (t_hour, L, rates) in zip(keys, results):
+        run = {
+            "L": L.tolist(),
+            "rates": rates.tolist(),
+            "conversion": float((1 - L[-1] / key[0]) * 100)
+        }
+        if not shared_axis:
+            run["t"] = t_hour.tolist()
+        runs.append(run)
+    if shared_axis:
+        t_hour = (results[0][0] if results else np.zeros(0, dtype=np.float32)).tolist()
+    else:
+        t_hour = None
+    return json.dumps({"t": t_hour, "runs": runs}, allow_nan=False).encode("utf-8")
+
+
+def encode_binary(keys, results):
+    t_hour = results[0][0] if results else np.zeros(0, dtype=np.float32)
+    parts = [BINARY_MAGIC, struct.pack("<II", len(results), len(t_hour)), t_hour.astype("<f4").tobytes()]
+    for _, L, rates in results:
+        parts.append(L.astype("<f4").tobytes())
+        parts.append(rates.astype("<f4").tobytes())
+    return b"".join(parts)
+
+
+def decode_binary(data):
+    # 解析 format=binary 的响应，返回 (t, L, rates)，L 与 rates 形状为 (组数, 点数)
+    if data[:4] != BINARY_MAGIC:
+        raise ValueError("无法识别的二进制格式")
+    n, m = struct.unpack("<II", data[4:12])
+    values = np.frombuffer(data, dtype="<f4", offset=12)
+    t_hour = values[:m]
+    runs = values[m:].reshape(n, 2, m) if n else np.zeros((0, 2, m), dtype=np.float32)
+    return t_hour, runs[:, 0, :], runs[:, 1, :]
+
+
+class SimulationHandler(BaseHTTPRequestHandler):
+    server_version = "LactoseSimService/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/health":
+            batcher = self.server.batcher
+            body = dict(batcher.stats)
+            body.update({
+                "status": "ok" if batcher.healthy else "degraded",
+                "workers": self.server.workers,
+                "last_error": batcher.last_error
+            })
+            self._send(200 if batcher.healthy else 503, json.dumps(body).encode("utf-8"), "application/json")
+        else:
+            self._send_error(404, "未找到该接口")
+
+    def do_POST(self):
+        if self.path != "/solve":
+            self._send_error(404, "未找到该接口")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("请求体必须为 JSON 对象")
+            raw_runs = request["batch"] if "batch" in request else [request.get("params", {})]
+            if not isinstance(raw_runs, list) or not 1 <= len(raw_runs) <= MAX_REQUEST_RUNS:
+                raise ValueError(f"batch 必须包含 1~{MAX_REQUEST_RUNS} 组参数")
+            keys = [parse_params(raw) for raw in raw_runs]
+            output_format = request.get("format", "json")
+            if output_format not in ("json", "binary"):
+                raise ValueError("format 必须为 json 或 binary")
+            if output_format == "binary" and len({(key[4], key[5]) for key in keys}) > 1:
+                raise ValueError("二进制格式要求所有参数使用相同的 t_max 与 steps")
+        except (ValueError, KeyError) as e:
+            self._send_error(400, str(e))
+            return
+
+        futures = [self.server.batcher.submit(key) for key in keys]
+        try:
+            results = [future.result(timeout=self.server.timeout_s) for future in futures]
+            if output_format == "binary":
+                self._send(200, encode_binary(keys, results), "application/octet-stream")
+            else:
+                self._send(200, encode_json(keys, results), "application/json")
+        except Exception as e:
+            self._send_error(500, f"计算错误: {e}")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send(status, json.dumps({"error": message}).encode("utf-8"), "application/json")
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def create_server(host="127.0.0.1", port=8765, workers=None, window_ms=5.0, max_batch=256,
+                  timeout_s=60.0, quiet=True, cache_entries=1024):
+    if workers is None:
+        workers = max(1, min(4, os.cpu_count() or 1))
+
+    def make_executor():
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=process_context())
+        # 预热所有工作进程，避免首个请求承担导入与启动开销
+        for future in [executor.submit(_warm_up) for _ in range(workers)]:
+            future.result()
+        return executor
+
+    server = ThreadingHTTPServer((host, port), SimulationHandler)
+    server.daemon_threads = True
+    server.batcher = MicroBatcher(make_executor, window=window_ms / 1000, max_batch=max_batch,
+                                  cache_entries=cache_entries)
+    server.workers = workers
+    server.timeout_s = timeout_s
+    server.quiet = quiet
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="乳糖水解模拟 HTTP 服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="工作进程数")
+    parser.add_argument("--window-ms", type=float, default=5.0, help="请求合并窗口 (毫秒)")
+    parser.add_argument("--max-batch", type=int, default=256, help="单批最多合并的请求数")
+    parser.add_argument("--cache-entries", type=int, default=1024, help="已求解结果的缓存条数")
+    parser.add_argument("--verbose", action="store_true", help="输出每个请求的访问日志")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.workers, args.window_ms, args.max_batch,
+                           quiet=not args.verbose, cache_entries=args.cache_entries)
+    print(f"模拟服务已启动: http://{args.host}:{args.port} (工作进程 {server.workers} 个)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.executor.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+# 页面中的静态文本（翻译字典与预先拼接好的说明文字）
+# Streamlit 每次交互都会重新运行页面脚本，而模块只在进程内导入一次，
+# 因此这些内容每个进程只构建一次。
+
+import textwrap
+
+# 翻译字典
+TRANSLATIONS = {
+    "zh": {
+        "title": "🍼 乳糖水解动力学模拟 - 教学版",
+        "intro": """
+        ### 欢迎体验乳糖水解模拟
+        乳糖水解是乳糖在β-半乳糖苷酶作用下分解为半乳糖和葡萄糖的过程，广泛应用于食品工业（如乳糖不耐受产品的生产）。本工具通过动力学模型模拟这一过程，帮助你理解酶催化反应和产物抑制的影响。
+
+        **学习目标：**
+        - 掌握Michaelis-Menten动力学的基本原理。
+        - 理解产物抑制（半乳糖抑制）如何影响反应速率。
+        - 通过交互式模拟，探索参数对乳糖水解的影响。
+        """,
+        "model_desc": "该模型模拟乳糖在β-半乳糖苷酶作用下的水解过程，考虑产物抑制效应（半乳糖抑制）。",
+        "equation": r"""
+        **三种抑制类型的动力学方程：**
+
+        **1. 竞争性抑制：** 
+        $$ r = \frac{V_{max} \cdot L}{K_m \cdot (1 + \frac{Gal}{K_i}) + L} $$
+
+        **2. 非竞争性抑制：** 
+        $$ r = \frac{V_{max} \cdot L}{(K_m + L) \cdot (1 + \frac{Gal}{K_i})} $$
+
+        **3. 反竞争性抑制：** 
+        $$ r = \frac{V_{max} \cdot L}{K_m + L \cdot (1 + \frac{Gal}{K_i})} $$
+        """,
+        "gal_desc": "其中 $Gal = L_0 - L$ 表示生成的半乳糖浓度",
+        "reaction_params": "反应参数",
+        "initial_lactose": "初始乳糖浓度 (mM) - 反应开始时的乳糖量",
+        "enzyme_conc": "酶浓度 (U/mL) - 决定反应速率的关键因素",
+        "reaction_time": "反应时间 (小时) - 模拟的总时间",
+        "kinetic_params": "动力学参数",
+        "km": "Km (mM) - 米氏常数，表示酶对底物的亲和力",
+        "ki": "Ki (mM) - 抑制常数，表示半乳糖的抑制强度",
+        "steps": "模拟精度 - 数值计算的步数",
+        "theory": "理论背景",
+        "theory_content": """
+        **动力学模型：**
+        - $L$: 乳糖浓度 (mM)
+        - $Gal$: 半乳糖浓度 (mM)
+        - $V_{max}$: 最大反应速率，与酶浓度 ($E$) 成正比
+        - $K_m$: 米氏常数，表示酶对底物的亲和力（$K_m$ 越小，亲和力越高）
+        - $K_i$: 产物抑制常数，表示半乳糖对酶的抑制强度（$K_i$ 越小，抑制越强）
+        """,
+        "equation_desc": "上述方程考虑了产物半乳糖对酶活的不同抑制机制。",
+        "inhibition_type": "产物抑制类型",
+        "competitive": "竞争性抑制",
+        "non_competitive": "非竞争性抑制",
+        "uncompetitive": "反竞争性抑制",
+        "inhibition_types_desc": {
+            "competitive": "抑制剂与底物竞争酶的活性位点",
+            "non_competitive": "抑制剂结合在酶的其他部位，降低酶活性",
+            "uncompetitive": "抑制剂只与酶-底物复合物结合"
+        },
+        "compare_inhibition": "比较有无产物抑制的模拟结果",
+        "final_lactose": "最终乳糖浓度",
+        "final_galactose": "最终半乳糖浓度",
+        "conversion_rate": "转化率",
+        "download_data": "下载模拟数据 (Excel)",
+        "rate_analysis": "反应速率分析",
+        "max_rate": "最大反应速率: **{:.2f} mM/小时** (发生在 {:.1f} 小时)",
+        "exercises": "练习题",
+        "exercise_content": """
+        1. 如果酶浓度加倍，乳糖水解速率会如何变化？尝试调整参数并观察结果。
+        2. 在什么条件下，产物抑制对反应速率的影响最小？调整 $K_i$ 值并分析。
+        3. 使用模拟工具，找到使转化率达到90%所需的最短反应时间。
+        """,
+        "error": "计算错误: {}",
+        "copyright": "© 生物反应工程教学模拟器 | 基于Michaelis-Menten动力学与产物抑制模型",
+        "lb_chart": "Lineweaver-Burk 图表",
+        "fixed_galactose": "固定半乳糖浓度 (mM)",
+        "lb_explanation": {
+            "competitive": "蓝色线条表示无抑制剂情况，遵循标准Michaelis-Menten动力学。红色线条表示固定半乳糖浓度下的竞争性抑制。注意两条线在y轴上的交点相同（绿色点），这表明竞争性抑制不影响 $V_{{max}}$，但改变了表观 $K_m$（与X轴负半轴的交点不同，蓝色和红色星号）。",
+            "non_competitive": "蓝色线条表示无抑制剂情况，遵循标准Michaelis-Menten动力学。红色线条表示固定半乳糖浓度下的非竞争性抑制。注意两条线在x轴上的交点相同（绿色星号），这表明非竞争性抑制不影响 $K_m$，但改变了表观 $V_{{max}}$（与y轴的交点不同）。",
+            "uncompetitive": "蓝色线条表示无抑制剂情况，遵循标准Michaelis-Menten动力学。红色线条表示固定半乳糖浓度下的反竞争性抑制。注意两条线平行（斜率相同），这表明反竞争性抑制同时改变了 $K_m$ 和 $V_{{max}}$，但斜率不变。"
+        },
+        "time_label": "时间 (小时)",
+        "concentration_label": "浓度 (mM)",
+        "substrate_label": "底物浓度 L (mM)",
+        "rate_label": "反应速率 (mM/小时)",
+        "no_inhibition": "无抑制",
+        "sweep": "参数扫描（后台计算）",
+        "sweep_param": "扫描参数",
+        "sweep_range": "扫描范围",
+        "sweep_points": "扫描点数",
+        "sweep_start": "开始扫描",
+        "sweep_cancel": "取消扫描",
+        "sweep_progress": "后台计算中：已完成 {} / {} 次模拟",
+        "sweep_cancelled": "参数已改变，之前的扫描任务已取消",
+        "sweep_stopped": "扫描任务已取消",
+        "sweep_failed": "扫描任务失败: {}",
+        "sweep_result": "最终转化率 vs. 扫描参数",
+        "save_run": "保存本次模拟到历史记录",
+        "run_saved": "已保存 {} 条模拟记录",
+        "save_sweep": "保存扫描结果到历史记录",
+        "run_history": "历史模拟对比",
+        "history_types": "筛选抑制类型",
+        "history_ki_max": "Ki 上限 (mM)",
+        "history_conversion_min": "最低转化率 (%)",
+        "history_count": "共 {} 条记录，符合条件 {} 条",
+        "history_empty": "暂无符合条件的历史记录",
+        "history_select": "选择要对比的记录",
+        "history_plot_title": "历史模拟乳糖浓度对比",
+        "dosing": "酶用量与反应时间优化",
+        "dosing_target": "目标转化率 (%)",
+        "dosing_enzyme_price": "酶单价 ($/U)",
+        "dosing_reactor_cost": "反应器占用成本 ($/小时)",
+        "dosing_volume": "反应体积 (L)",
+        "dosing_time_limit": "允许的最长反应时间 (小时)",
+        "dosing_result": "**{}**：最优酶浓度 **{:.3f} U/mL**，反应时间 **{:.2f} 小时**，单批成本 **${:.2f}**（酶 ${:.2f} + 反应器 ${:.2f}）",
+        "dosing_infeasible": "**{}**：在酶浓度与反应时间限制内无法达到目标转化率",
+        "dosing_pareto": "酶成本与反应时间的权衡（帕累托前沿）",
+        "dosing_enzyme_cost": "酶成本 ($/批)",
+        "dosing_optimum": "最优点",
+        "dosing_show": "计算最优方案"
+    },
+    "en": {
+        "title": "🍼 Lactose Hydrolysis Kinetics Simulation - Educational Version",
+        "intro": """
+        ### Welcome to Lactose Hydrolysis Simulation
+        Lactose hydrolysis is the process where lactose is broken down into galactose and glucose by β-galactosidase, widely used in the food industry (e.g., lactose-free products). This tool simulates this process using a kinetic model, helping you understand enzyme catalysis and product inhibition effects.
+
+        **Learning Objectives:**
+        - Understand the basics of Michaelis-Menten kinetics.
+        - Explore how product inhibition (galactose) affects reaction rates.
+        - Investigate parameter effects on lactose hydrolysis through interactive simulation.
+        """,
+        "model_desc": "This model simulates lactose hydrolysis by β-galactosidase, considering product inhibition (galactose inhibition).",
+        "equation": r"""
+        **Kinetic Equations for Three Inhibition Types:**
+
+        **1. Competitive Inhibition:** 
+        $$ r = \frac{V_{max} \cdot L}{K_m \cdot (1 + \frac{Gal}{K_i}) + L} $$
+
+        **2. Non-competitive Inhibition:** 
+        $$ r = \frac{V_{max} \cdot L}{(K_m + L) \cdot (1 + \frac{Gal}{K_i})} $$
+
+        **3. Uncompetitive Inhibition:** 
+        $$ r = \frac{V_{max} \cdot L}{K_m + L \cdot (1 + \frac{Gal}{K_i})} $$
+        """,
+        "gal_desc": "where $Gal = L_0 - L$ represents the concentration of produced galactose",
+        "reaction_params": "Reaction Parameters",
+        "initial_lactose": "Initial Lactose Concentration (mM) - Amount of lactose at the start",
+        "enzyme_conc": "Enzyme Concentration (U/mL) - Key factor determining reaction rate",
+        "reaction_time": "Reaction Time (hours) - Total simulation duration",
+        "kinetic_params": "Kinetic Parameters",
+        "km": "Km (mM) - Michaelis Constant, indicating enzyme-substrate affinity",
+        "ki": "Ki (mM) - Inhibition Constant, indicating galactose inhibition strength",
+        "steps": "Simulation Precision - Number of calculation points",
+        "theory": "Theoretical Background",
+        "theory_content": """
+        **Kinetic Model:**
+        - $L$: Lactose concentration (mM)
+        - $Gal$: Galactose concentration (mM)
+        - $V_{max}$: Maximum reaction rate, proportional to enzyme concentration ($E$)
+        - $K_m$: Michaelis constant, indicating enzyme-substrate affinity (lower $K_m$, higher affinity)
+        - $K_i$: Product inhibition constant, indicating galactose inhibition strength (lower $K_i$, stronger inhibition)
+        """,
+        "equation_desc": "These equations account for different inhibition mechanisms of the enzyme by the product galactose.",
+        "inhibition_type": "Product Inhibition Type",
+        "competitive": "Competitive Inhibition",
+        "non_competitive": "Non-competitive Inhibition",
+        "uncompetitive": "Uncompetitive Inhibition",
+        "inhibition_types_desc": {
+            "competitive": "Inhibitor competes with substrate for active site",
+            "non_competitive": "Inhibitor binds to enzyme at different site, reducing activity",
+            "uncompetitive": "Inhibitor binds only to enzyme-substrate complex"
+        },
+        "compare_inhibition": "Compare Simulation with and without Product Inhibition",
+        "final_lactose": "Final Lactose Concentration",
+        "final_galactose": "Final Galactose Concentration",
+        "conversion_rate": "Conversion Rate",
+        "download_data": "Download Simulation Data (Excel)",
+        "rate_analysis": "Reaction Rate Analysis",
+        "max_rate": "Maximum Reaction Rate: **{:.2f} mM/hour** (occurs at {:.1f} hours)",
+        "exercises": "Exercises",
+        "exercise_content": """
+        1. How does doubling the enzyme concentration affect the hydrolysis rate? Adjust the parameters and observe.
+        2. Under what conditions is the effect of product inhibition minimal? Adjust $K_i$ and analyze.
+        3. Use the tool to find the shortest reaction time needed for a 90% conversion rate.
+        """,
+        "error": "Calculation Error: {}",
+        "copyright": "© Bioreaction Engineering Educational Simulator | Based on Michaelis-Menten Kinetics with Product Inhibition Model",
+        "lb_chart": "Lineweaver-Burk Plot",
+        "fixed_galactose": "Fixed Galactose Concentration (mM)",
+        "lb_explanation": {
+            "competitive": "Blue line represents no inhibitor case, following standard Michaelis-Menten kinetics. Red line represents competitive inhibition at fixed galactose concentration. Note that both lines intersect at the same point on the y-axis (green point), indicating that competitive inhibition does not affect $V_{{max}}$, but changes the apparent $K_m$ (different intercepts on the negative x-axis, blue and red stars).",
+            "non_competitive": "Blue line represents no inhibitor case, following standard Michaelis-Menten kinetics. Red line represents non-competitive inhibition at fixed galactose concentration. Note that both lines intersect at the same point on the x-axis (green star), indicating that non-competitive inhibition does not affect $K_m$, but changes the apparent $V_{{max}}$ (different intercepts on the y-axis).",
+            "uncompetitive": "Blue line represents no inhibitor case, following standard Michaelis-Menten kinetics. Red line represents uncompetitive inhibition at fixed galactose concentration. Note that both lines are parallel (same slope), indicating that uncompetitive inhibition changes both $K_m$ and $V_{{max}}$, but the slope remains constant."
+        },
+        "time_label": "Time (hours)",
+        "concentration_label": "Concentration (mM)",
+        "substrate_label": "Substrate Concentration L (mM)",
+        "rate_label": "Reaction Rate (mM/hour)",
+        "no_inhibition": "No Inhibition",
+        "sweep": "Parameter Sweep (Background Computation)",
+        "sweep_param": "Sweep Parameter",
+        "sweep_range": "Sweep Range",
+        "sweep_points": "Number of Sweep Points",
+        "sweep_start": "Start Sweep",
+        "sweep_cancel": "Cancel Sweep",
+        "sweep_progress": "Computing in background: {} / {} simulations finished",
+        "sweep_cancelled": "Parameters changed, the previous sweep has been cancelled",
+        "sweep_stopped": "Sweep cancelled",
+        "sweep_failed": "Sweep failed: {}",
+        "sweep_result": "Final Conversion vs. Sweep Parameter",
+        "save_run": "Save This Simulation to History",
+        "run_saved": "Saved {} simulation records",
+        "save_sweep": "Save Sweep Results to History",
+        "run_history": "Compare Past Simulations",
+        "history_types": "Filter Inhibition Types",
+        "history_ki_max": "Maximum Ki (mM)",
+        "history_conversion_min": "Minimum Conversion (%)",
+        "history_count": "{} records in total, {} match the filters",
+        "history_empty": "No matching simulation records",
+        "history_select": "Select records to compare",
+        "history_plot_title": "Lactose Concentration of Past Simulations",
+        "dosing": "Enzyme Dose and Reaction Time Optimization",
+        "dosing_target": "Target Conversion (%)",
+        "dosing_enzyme_price": "Enzyme Price ($/U)",
+        "dosing_reactor_cost": "Reactor Cost ($/hour)",
+        "dosing_volume": "Reaction Volume (L)",
+        "dosing_time_limit": "Maximum Batch Time (hours)",
+        "dosing_result": "**{}**: optimal enzyme dose **{:.3f} U/mL**, batch time **{:.2f} hours**, batch cost **${:.2f}** (enzyme ${:.2f} + reactor ${:.2f})",
+        "dosing_infeasible": "**{}**: the target conversion cannot be reached within the dose and time limits",
+        "dosing_pareto": "Enzyme Cost vs. Batch Time (Pareto Front)",
+        "dosing_enzyme_cost": "Enzyme Cost ($/batch)",
+        "dosing_optimum": "Optimum",
+        "dosing_show": "Compute Optimal Dosing"
+    }
+}
+
+
+def _inhibition_desc(lang):
+    t = TRANSLATIONS[lang]
+    header = "**抑制类型说明:**" if lang == "zh" else "**Inhibition Type Descriptions:**"
+    lines = [f"- **{t[key]}**: {t['inhibition_types_desc'][key]}"
+             for key in ("competitive", "non_competitive", "uncompetitive")]
+    return header + "\n\n" + "\n".join(lines)
+
+
+# 侧边栏抑制类型说明
+INHIBITION_DESC = {lang: _inhibition_desc(lang) for lang in TRANSLATIONS}
+
+# 米氏方程介绍
+MICHAELIS_MENTEN = {
+    "zh": "\n\n".join([
+        "### 米氏方程 (Michaelis-Menten Equation)",
+        r"酶催化反应的基本动力学方程：",
+        r"$$ r = \frac{V_{max} \cdot L}{K_m + L} $$",
+        r"其中：",
+        "\n".join([
+            r"- $r$: 反应速率 (mM/小时)",
+            r"- $V_{max}$: 最大反应速率 (mM/小时)",
+            r"- $L$: 底物浓度 (mM)",
+            r"- $K_m$: 米氏常数 (mM)，表示酶对底物的亲和力"
+        ])
+    ]),
+    "en": "\n\n".join([
+        "### Michaelis-Menten Equation",
+        "The fundamental kinetic equation for enzyme-catalyzed reactions:",
+        r"$$ r = \frac{V_{max} \cdot L}{K_m + L} $$",
+        "Where:",
+        "\n".join([
+            "- $r$: Reaction rate (mM/hour)",
+            "- $V_{max}$: Maximum reaction rate (mM/hour)",
+            "- $L$: Substrate concentration (mM)",
+            "- $K_m$: Michaelis constant (mM), indicating enzyme-substrate affinity"
+        ])
+    ])
+}
+
+# 产物抑制模型介绍
+PRODUCT_INHIBITION = {
+    lang: "\n\n".join([
+        "### 产物抑制模型" if lang == "zh" else "### Product Inhibition Model",
+        textwrap.dedent(TRANSLATIONS[lang]["equation"]).strip(),
+        TRANSLATIONS[lang]["gal_desc"]
+    ])
+    for lang in TRANSLATIONS
+}
@@ -0,0 +1,103 @@
+# compact_results 的回归测试：降采样的边界情况与序列化
+# 运行：python -m pytest -q test_compact_results.py
+
+import pickle
+
+import numpy as np
+import pytest
+
+from compact_results import CompactResult, decimate_xy, lttb, minmax_buckets, shared_time_axis
+from lactose_model import simulate
+
+N = 1000
+
+
+def curve(n=N, seed=0):
+    x = np.linspace(0, 3, n)
+    y = 200 * np.exp(-x) + np.random.default_rng(seed).normal(0, 2, n)
+    return x, y
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+@pytest.mark.parametrize("max_points", [0, 1, 2, 3, 4, 5, 10, 400, N - 2, N - 1, N, N + 1])
+def test_decimate_bounds_and_endpoints(method, max_points):
+    x, y = curve()
+    x_out, y_out = decimate_xy(x, y, max_points=max_points, method=method)
+    assert len(x_out) == len(y_out) <= max(max_points, 0)
+    assert np.all(np.diff(x_out) > 0)
+    if max_points >= 2:
+        assert (x_out[0], x_out[-1]) == (x[0], x[-1])
+        assert (y_out[0], y_out[-1]) == (y[0], y[-1])
+
+
+@pytest.mark.parametrize("threshold", [3, 4, N // 2, N - 2, N - 1])
+def test_lttb_returns_threshold_increasing_indices(threshold):
+    x, y = curve()
+    indices = lttb(x, y, threshold)
+    assert len(indices) == threshold
+    assert indices[0] == 0 and indices[-1] == N - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_small_threshold_and_short_input():
+    x, y = curve()
+    assert lttb(x, y, 2).tolist() == [0, N - 1]
+    assert lttb(x, y, 1).tolist() == [0]
+    assert lttb(x, y, 0).tolist() == []
+    assert lttb(x[:5], y[:5], 400).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_lttb_reversed_x():
+    # x 递减（例如以乳糖浓度为横轴）时仍保留首尾点，点数与下标顺序不变
+    x, y = curve()
+    forward = lttb(x, y, 50)
+    backward = lttb(x[::-1], y[::-1], 50)
+    assert backward[0] == 0 and backward[-1] == N - 1
+    assert np.all(np.diff(backward) > 0)
+    assert len(backward) == len(forward) == 50
+
+
+@pytest.mark.parametrize("n_buckets", [1, 2, 10, 100, (N - 3) // 2])
+def test_minmax_keeps_extrema(n_buckets):
+    x, y = curve()
+    indices = minmax_buckets(y, n_buckets)
+    assert len(indices) <= 2 * n_buckets + 2
+    assert indices[0] == 0 and indices[-1] == N - 1
+    assert y[indices].min() == y.min()
+    assert y[indices].max() == y.max()
+    # 每个桶内的极值都被保留
+    edges = np.linspace(0, N, n_buckets + 1).astype(int)
+    kept = set(indices.tolist())
+    for start, end in zip(edges[:-1], edges[1:]):
+        assert start + int(np.argmin(y[start:end])) in kept
+        assert start + int(np.argmax(y[start:end])) in kept
+
+
+def test_minmax_small_bucket_count():
+    x, y = curve()
+    assert minmax_buckets(y, 0).tolist() == [0, N - 1]
+    assert minmax_buckets(y[:6], 2).tolist() == list(range(6))
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_compact_result_pickle_reuses_shared_axis(dtype):
+    result = CompactResult.from_simulation(200.0, simulate(200.0, 1.0, 30.0, 10.0, 1.5, 137, "competitive"), dtype)
+    assert result.t_hour is shared_time_axis(1.5, 137)
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored.t_hour is result.t_hour
+    assert restored.L0 == result.L0
+    assert restored.L.dtype == dtype
+    np.testing.assert_array_equal(restored.L, result.L)
+    t_hour, L, Gal, rates = restored
+    np.testing.assert_array_equal(Gal, result.Gal)
+    np.testing.assert_array_equal(rates, result.rates)
+    # 序列化数据中不包含时间轴
+    assert len(pickle.dumps(result)) < result.nbytes
+
+
+def test_compact_result_pickle_keeps_irregular_axis():
+    t_hour = np.array([0.0, 0.1, 0.5, 2.0])
+    result = CompactResult(200.0, t_hour, np.array([200.0, 180.0, 120.0, 40.0]))
+    restored = pickle.loads(pickle.dumps(result))
+    np.testing.assert_array_equal(restored.t_hour, t_hour)
+    np.testing.assert_array_equal(restored.L, result.L)
@@ -0,0 +1,39 @@
+# dosing_optimizer 的回归测试：闭式解与数值求解器一致，转化率与时间互为反函数
+# 运行：python -m pytest -q test_dosing_optimizer.py
+
+import numpy as np
+import pytest
+
+from dosing_optimizer import conversion_at_time, optimal_dosing, time_to_conversion, verify_dosing
+from lactose_model import INHIBITION_TYPES
+
+
+@pytest.mark.parametrize("inhibition_type", INHIBITION_TYPES)
+@pytest.mark.parametrize("L0", [50.0, 200.0])
+def test_optimal_dosing_reaches_target_conversion(inhibition_type, L0):
+    result = optimal_dosing(L0, 30.0, 10.0, inhibition_type, target_conversion=90.0)
+    assert result["feasible"]
+    E, t_max = float(result["E"]), float(result["t_max"])
+    assert 0.001 <= E <= 10.0
+    assert t_max <= 12.0
+    assert verify_dosing(L0, E, 30.0, 10.0, t_max, inhibition_type) == pytest.approx(90.0, abs=1e-4)
+
+
+def test_optimal_dosing_reports_infeasible_combinations():
+    # L0 = 500 mM 时非竞争性抑制即使用最大酶量也无法在 12 小时内达到 90%
+    result = optimal_dosing(np.array([200.0, 500.0]), 30.0, 10.0, "non_competitive")
+    assert result["feasible"].tolist() == [True, False]
+    assert np.isnan(result["E"][1]) and np.isnan(result["total_cost"][1])
+
+
+@pytest.mark.parametrize("inhibition_type", INHIBITION_TYPES)
+def test_conversion_at_time_inverts_time_to_conversion(inhibition_type):
+    conversion = np.array([1.0, 10.0, 50.0, 90.0, 99.0, 99.9])
+    t_hours = time_to_conversion(200.0, 1.5, 30.0, 10.0, conversion, inhibition_type)
+    assert np.all(np.diff(t_hours) > 0)
+    assert conversion_at_time(200.0, 1.5, 30.0, 10.0, t_hours, inhibition_type) == pytest.approx(conversion, abs=1e-9)
+
+
+def test_time_to_conversion_rejects_out_of_range_target():
+    with pytest.raises(ValueError):
+        time_to_conversion(200.0, 1.0, 30.0, 10.0, 100.0, "competitive")
@@ -0,0 +1,81 @@
+# job_queue 的回归测试：缓存命中、取消、失败传播与 asyncio 接口
+# 运行：python -m pytest -q test_job_queue.py
+
+import asyncio
+
+import pytest
+
+from compact_results import CompactResult
+from job_queue import CANCELLED, DONE, FAILED, JobQueue, ResultCache
+from lactose_model import cache_key, simulate
+
+TASKS = [(200.0, Vmax, 30.0, 10.0, 1.0, 50, "competitive") for Vmax in (0.5, 1.0, 1.5, 2.0)]
+
+
+@pytest.fixture
+def job_queue():
+    job_queue = JobQueue(max_workers=1)
+    yield job_queue
+    job_queue.shutdown(wait=True)
+
+
+def test_fully_cached_job_finishes_immediately(job_queue):
+    for task in TASKS:
+        job_queue.cache.put(cache_key(*task), CompactResult.from_simulation(task[0], simulate(*task)))
+    job = job_queue.submit(TASKS)
+    # 全部命中缓存时 submit 返回前任务已完成，且没有提交任何子任务
+    assert job.status == DONE
+    assert job.progress == 1.0
+    assert job._futures == []
+    assert job.result(timeout=0) == [job_queue.cache.get(cache_key(*task)) for task in TASKS]
+
+
+class CancellingCache(ResultCache):
+    # 查询第 cancel_at 个子任务时取消 owner 的全部任务，模拟提交过程中另一个线程调用 cancel_owner
+
+    def __init__(self, cancel_at):
+        super().__init__()
+        self.cancel_at = cancel_at
+        self.calls = 0
+        self.job_queue = None
+
+    def get(self, key):
+        self.calls += 1
+        if self.calls == self.cancel_at:
+            self.job_queue.cancel_owner("session-1")
+        return super().get(key)
+
+
+def test_cancel_owner_stops_further_submissions():
+    cache = CancellingCache(cancel_at=3)
+    job_queue = JobQueue(max_workers=1, cache=cache)
+    cache.job_queue = job_queue
+    try:
+        job = job_queue.submit(TASKS, owner="session-1")
+        assert job.status == CANCELLED
+        # 前两个子任务已提交，第三个在查询缓存时被取消，之后不再提交
+        assert len(job._futures) == 2
+        assert cache.calls == 3
+        with pytest.raises(RuntimeError):
+            job.result(timeout=0)
+    finally:
+        job_queue.shutdown(wait=True)
+
+
+def test_failing_task_fails_job_with_original_error(job_queue):
+    job = job_queue.submit(TASKS[:1] + [(-1.0, 1.0, 30.0, 10.0, 1.0, 50, "competitive")])
+    assert job.wait(timeout=60)
+    assert job.status == FAILED
+    assert isinstance(job.error, ValueError)
+    assert str(job.error) == "参数必须为正数"
+    with pytest.raises(ValueError, match="参数必须为正数"):
+        job.result(timeout=0)
+
+
+def test_submit_async_returns_results(job_queue):
+    results = asyncio.run(job_queue.submit_async(TASKS, label="sweep"))
+    assert len(results) == len(TASKS)
+    for task, result in zip(TASKS, results):
+        assert isinstance(result, CompactResult)
+        assert result.L[-1] == pytest.approx(simulate(*task)[1][-1], rel=1e-5)
+        assert job_queue.cache.get(cache_key(*task)) is result
@@ -0,0 +1,59 @@
+# online_estimator 的回归测试：参数辨识、ETA 置信区间与中途接入批次
+# 运行：python -m pytest -q test_online_estimator.py
+
+import numpy as np
+import pytest
+
+from dosing_optimizer import time_to_conversion
+from lactose_model import simulate
+from online_estimator import ReactorFleet, replay, write_demo_csv
+
+L0, KM, KI = 200.0, 30.0, 10.0
+
+
+def test_demo_replay_recovers_parameters_and_eta(tmp_path):
+    path = str(tmp_path / "demo.csv")
+    true_Vmax = write_demo_csv(path, L0=L0, Km=KM, Ki=KI, t_max=6.0, seed=0)
+    # 初始猜测故意偏离真实值
+    fleet = ReactorFleet(L0=L0, Km=KM, Vmax=1.0, Ki=5.0, inhibition_type="competitive")
+    count, _ = replay(path, fleet, quiet=True)
+    assert count == 12 * 73
+    snapshots = fleet.snapshots(90.0)
+    Vmax_errors = []
+    for reactor_id, Vmax in true_Vmax.items():
+        snapshot = snapshots[reactor_id]
+        Vmax_errors.append(abs(snapshot["Vmax"] - Vmax) / Vmax)
+        assert abs(snapshot["Vmax"] - Vmax) < 3 * snapshot["Vmax_std"]
+        assert abs(snapshot["Ki"] - KI) < 3 * snapshot["Ki_std"]
+        # ETA 落在报告的 1σ 区间内
+        eta = time_to_conversion(L0, Vmax, KM, KI, 90.0, "competitive")
+        assert abs(snapshot["eta_h"] - eta) < snapshot["remaining_std_h"]
+        assert snapshot["rejected"] <= 3
+    assert np.median(Vmax_errors) < 0.1
+
+
+@pytest.mark.parametrize("inhibition_type", ["competitive", "uncompetitive", "non_competitive"])
+def test_tracking_joins_running_batch(inhibition_type):
+    # 读数从 t = 1 h 开始，此时已有相当一部分乳糖被水解
+    rng = np.random.default_rng(1)
+    t_hour, L, _, _ = simulate(L0, 1.5, KM, KI, 6.0, 73, inhibition_type)
+    fleet = ReactorFleet(L0=L0, Km=KM, Vmax=1.0, Ki=5.0, inhibition_type=inhibition_type)
+    for t, L_true in zip(t_hour, L):
+        if t >= 1.0 - 1e-9:
+            fleet.update("R01", float(t), float(L_true + rng.normal(0, 2.0)))
+    snapshot = fleet.snapshots(90.0)["R01"]
+    assert snapshot["samples"] == 61
+    assert snapshot["rejected"] == 0
+    assert abs(snapshot["Vmax"] - 1.5) < 2 * snapshot["Vmax_std"]
+    assert abs(snapshot["Ki"] - KI) < 2 * snapshot["Ki_std"]
+    eta = time_to_conversion(L0, 1.5, KM, KI, 90.0, inhibition_type)
+    assert abs(snapshot["eta_h"] - eta) < snapshot["remaining_std_h"]
+
+
+def test_running_batch_without_L0_is_rejected():
+    fleet = ReactorFleet(Km=KM, Vmax=1.0, Ki=5.0)
+    with pytest.raises(ValueError):
+        fleet.update("R01", 1.0, 120.0)
+    # 从 t = 0 开始时第一个读数即为 L0
+    assert fleet.update("R01", 0.0, 200.0)
+    assert fleet.reactors["R01"].L0 == 200.0
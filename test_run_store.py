@@ -0,0 +1,51 @@
+# run_store 的回归测试：过滤条件走索引，排序结果正确
+# 运行：python -m pytest -q test_run_store.py
+
+import numpy as np
+import pytest
+
+from run_store import RunStore
+
+
+def fake_result(L0, conversion, steps=20):
+    t_hour = np.linspace(0, 1, steps)
+    L = np.linspace(L0, L0 * (1 - conversion / 100), steps)
+    return t_hour, L, L0 - L, np.full(steps, conversion)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RunStore(str(tmp_path / "runs.sqlite"))
+    runs = []
+    for i in range(40):
+        Ki = 1.0 + i
+        conversion = 50.0 + i
+        runs.append(((200.0, 1.0, 30.0, Ki, 1.0, 20, "competitive"), fake_result(200.0, conversion)))
+    store.add_runs(runs)
+    return store
+
+
+def test_ki_conversion_filter_uses_index(store):
+    plan = " | ".join(store.explain_query(Ki_max=5, conversion_min=50))
+    assert "idx_runs_ki_conversion" in plan
+    assert "SCAN runs" not in plan
+
+
+def test_unordered_filter_uses_index(store):
+    plan = " | ".join(store.explain_query(order_by=None, Ki_max=5, conversion_min=50))
+    assert "SEARCH runs USING" in plan
+    assert "SCAN runs" not in plan
+
+
+def test_filtered_query_is_sorted(store):
+    rows = store.query(order_by="Ki ASC", Ki_max=5, conversion_min=52)
+    assert [row["Ki"] for row in rows] == [3.0, 4.0, 5.0]
+    rows = store.query(order_by="conversion DESC", Ki_max=5, limit=2)
+    assert [row["conversion"] for row in rows] == pytest.approx([54.0, 53.0])
+
+
+def test_invalid_filter_rejected(store):
+    with pytest.raises(ValueError):
+        store.query(trajectory_max=1)
+    with pytest.raises(ValueError):
+        store.query(order_by="trajectory")
@@ -0,0 +1,129 @@
+# sim_service 的回归测试：参数校验、混合批次与 JSON 输出
+# 运行：python -m pytest -q test_sim_service.py
+
+import json
+import os
+import signal
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sim_service import create_server, parse_params
+
+
+@pytest.fixture(scope="module")
+def service():
+    # 较长的合并窗口，保证并发请求被合并到同一批
+    server = create_server(port=0, workers=1, window_ms=200)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.batcher.executor.shutdown(cancel_futures=True)
+
+
+def post(server, payload):
+    data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(server.url + "/solve", data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize("raw", [
+    {"E": 1e-7},
+    {"Km": float("nan")},
+    {"Ki": float("inf")},
+    {"t_max": 1e9},
+    {"steps": 1},
+    {"steps": 2.9}
+])
+def test_parse_params_rejects_invalid(raw):
+    with pytest.raises(ValueError):
+        parse_params(raw)
+
+
+def test_nan_in_request_body_is_rejected(service):
+    status, body = post(service, b'{"params": {"Km": NaN}}')
+    assert status == 400
+    assert "error" in body
+
+
+def test_non_integer_steps_is_rejected(service):
+    status, body = post(service, {"params": {"steps": 2.9}})
+    assert status == 400
+    assert "steps" in body["error"]
+    status, _ = post(service, {"params": {"steps": 50.0}})
+    assert status == 200
+
+
+def test_bad_params_do_not_fail_concurrent_batch(service):
+    # 一个请求的参数取整后为 0，另一个合法请求在同一合并窗口内到达
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        bad = executor.submit(post, service, {"params": {"E": 1e-7}})
+        good = executor.submit(post, service, {"params": {"E": 1.0}})
+        bad_status, _ = bad.result()
+        good_status, good_body = good.result()
+    assert bad_status == 400
+    assert good_status == 200
+    assert len(good_body["runs"]) == 1
+
+
+def test_batcher_isolates_invalid_key(service):
+    # 绕过 parse_params 直接提交非法键，同批的合法请求仍应成功
+    bad = service.batcher.submit((200.0, 0.0, 30.0, 10.0, 1.0, 50, "competitive"))
+    good = service.batcher.submit(parse_params({"steps": 50}))
+    t_hour, L, rates = good.result(timeout=30)
+    assert len(L) == 50
+    with pytest.raises(ValueError):
+        bad.result(timeout=30)
+
+
+def test_json_mixed_axes_returns_per_run_time(service):
+    status, body = post(service, {"batch": [{"t_max": 1, "steps": 50}, {"t_max": 3, "steps": 100}]})
+    assert status == 200
+    assert body["t"] is None
+    assert [len(run["t"]) for run in body["runs"]] == [50, 100]
+    assert [len(run["L"]) for run in body["runs"]] == [50, 100]
+    assert body["runs"][1]["t"][-1] == pytest.approx(3.0)
+
+
+def test_json_shared_axis_keeps_top_level_time(service):
+    status, body = post(service, {"batch": [{"E": 1.0, "steps": 50}, {"E": 2.0, "steps": 50}]})
+    assert status == 200
+    assert len(body["t"]) == 50
+    assert all("t" not in run for run in body["runs"])
+
+
+def test_repeated_params_are_served_from_cache(service):
+    # 两个请求先后到达、落在不同的合并窗口中，第二次不再求解
+    payload = {"params": {"E": 2.5, "Ki": 7.0, "steps": 80}}
+    status, first = post(service, payload)
+    assert status == 200
+    stats = dict(service.batcher.stats)
+    status, second = post(service, payload)
+    assert status == 200
+    assert second == first
+    assert service.batcher.stats["cache_hits"] == stats["cache_hits"] + 1
+    assert service.batcher.stats["unique"] == stats["unique"]
+    assert service.batcher.stats["batches"] == stats["batches"]
+
+
+def test_worker_crash_rebuilds_pool(service):
+    for pid in list(service.batcher.executor._processes):
+        os.kill(pid, signal.SIGKILL)
+    time.sleep(0.5)
+    status, body = post(service, {"params": {"E": 3.0}})
+    assert status == 200
+    with urllib.request.urlopen(service.url + "/health", timeout=30) as response:
+        health = json.loads(response.read())
+    assert health["status"] == "ok"
+    assert health["pool_restarts"] >= 1
@@ -2,62 +2,26 @@
 # 请确保已安装以下库：
 # pip install streamlit numpy scipy matplotlib pandas openpyxl matplotlib-font-manager
 
+# scipy、matplotlib、pandas、openpyxl 均在首次使用时才导入，缩短进程冷启动时间；
+# 导入耗时可用 python import_report.py 查看
+
 import streamlit as st
 import numpy as np
-from scipy.integrate import odeint
-import matplotlib.pyplot as plt
-import pandas as pd
-import matplotlib.font_manager as fm
 from io import BytesIO
-import matplotlib as mpl
 import os
 import urllib.request
+import time
+import uuid
 
-# 设置全局字体以支持中文
-try:
-    # 获取当前文件所在目录
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    fonts_dir = os.path.join(current_dir, 'fonts')
-
-    # 确保 fonts 目录存在
-    if not os.path.exists(fonts_dir):
-        os.makedirs(fonts_dir)
-
-    # 检查字体文件是否存在，如果不存在则尝试下载
-    simhei_path = os.path.join(fonts_dir, 'simhei.ttf')
-    msyh_path = os.path.join(fonts_dir, 'msyh.ttf')
-
-    if not os.path.exists(simhei_path):
-        # 从 GitHub 下载 SimHei 替代字体
-        simhei_url = "https://github.com/googlefonts/noto-cjk/raw/main/Sans/OTF/SimplifiedChinese/NotoSansCJKsc-Regular.otf"
-        urllib.request.urlretrieve(simhei_url, simhei_path)
+from static_content import TRANSLATIONS, INHIBITION_DESC, MICHAELIS_MENTEN, PRODUCT_INHIBITION
+from lactose_model import cache_key, simulate
+from job_queue import JobQueue, sweep_tasks, RUNNING, DONE, CANCELLED, FAILED
+from run_store import RunStore
+from dosing_optimizer import optimal_dosing, pareto_front
+from compact_results import CompactResult, decimate_xy
 
-    if not os.path.exists(msyh_path):
-        # 从 GitHub 下载 Microsoft YaHei 替代字体
-        msyh_url = "https://github.com/googlefonts/noto-cjk/raw/main/Sans/OTF/SimplifiedChinese/NotoSansCJKsc-Regular.otf"
-        urllib.request.urlretrieve(msyh_url, msyh_path)
-
-    # 添加字体目录到字体路径
-    font_files = fm.findSystemFonts(fontpaths=[fonts_dir])
-    for font_file in font_files:
-        fm.fontManager.addfont(font_file)
-
-    # 设置中文字体
-    plt.rcParams['font.sans-serif'] = ['Noto Sans SC', 'SimHei', 'Microsoft YaHei', 'Arial Unicode MS', 'sans-serif']
-    plt.rcParams['axes.unicode_minus'] = False
-
-    # 验证字体是否加载成功
-    zh_font = fm.FontProperties(fname=simhei_path)
-
-    # 显示成功消息
-    st.sidebar.success("中文字体已成功加载")
-
-except Exception as e:
-    # 如果找不到中文字体，使用默认字体
-    st.sidebar.warning(f"无法加载中文字体: {str(e)}，图表中文显示可能异常")
-    zh_font = fm.FontProperties()
-    plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial Unicode MS', 'sans-serif']
-    plt.rcParams['axes.unicode_minus'] = False
+# 图表中每条曲线最多绘制的点数（降采样后视觉上与原曲线一致）
+PLOT_POINTS = 400
 
 # 检查 Streamlit 版本
 try:
@@ -71,174 +35,10 @@ except ImportError:
 st.set_page_config(page_title="乳糖水解动力学模拟 - 教学版", layout="wide")
 
 # 语言选择
-language = st.sidebar.selectbox("选择语言 / Select Language", ["中文", "English"])
+language = st.sidebar.selectbox("选择语言 / Select Language", ["中文", "English"], key="language")
 lang = "zh" if language == "中文" else "en"
 
-# 翻译字典
-translations = {
-    "zh": {
-        "title": "🍼 乳糖水解动力学模拟 - 教学版",
-        "intro": """
-        ### 欢迎体验乳糖水解模拟
-        乳糖水解是乳糖在β-半乳糖苷酶作用下分解为半乳糖和葡萄糖的过程，广泛应用于食品工业（如乳糖不耐受产品的生产）。本工具通过动力学模型模拟这一过程，帮助你理解酶催化反应和产物抑制的影响。
-
-        **学习目标：**
-        - 掌握Michaelis-Menten动力学的基本原理。
-        - 理解产物抑制（半乳糖抑制）如何影响反应速率。
-        - 通过交互式模拟，探索参数对乳糖水解的影响。
-        """,
-        "model_desc": "该模型模拟乳糖在β-半乳糖苷酶作用下的水解过程，考虑产物抑制效应（半乳糖抑制）。",
-        "equation": r"""
-        **三种抑制类型的动力学方程：**
-
-        **1. 竞争性抑制：** 
-        $$ r = \frac{V_{max} \cdot L}{K_m \cdot (1 + \frac{Gal}{K_i}) + L} $$
-
-        **2. 非竞争性抑制：** 
-        $$ r = \frac{V_{max} \cdot L}{(K_m + L) \cdot (1 + \frac{Gal}{K_i})} $$
-
-        **3. 反竞争性抑制：** 
-        $$ r = \frac{V_{max} \cdot L}{K_m + L \cdot (1 + \frac{Gal}{K_i})} $$
-        """,
-        "gal_desc": "其中 $Gal = L_0 - L$ 表示生成的半乳糖浓度",
-        "reaction_params": "反应参数",
-        "initial_lactose": "初始乳糖浓度 (mM) - 反应开始时的乳糖量",
-        "enzyme_conc": "酶浓度 (U/mL) - 决定反应速率的关键因素",
-        "reaction_time": "反应时间 (小时) - 模拟的总时间",
-        "kinetic_params": "动力学参数",
-        "km": "Km (mM) - 米氏常数，表示酶对底物的亲和力",
-        "ki": "Ki (mM) - 抑制常数，表示半乳糖的抑制强度",
-        "steps": "模拟精度 - 数值计算的步数",
-        "theory": "理论背景",
-        "theory_content": """
-        **动力学模型：**
-        - $L$: 乳糖浓度 (mM)
-        - $Gal$: 半乳糖浓度 (mM)
-        - $V_{max}$: 最大反应速率，与酶浓度 ($E$) 成正比
-        - $K_m$: 米氏常数，表示酶对底物的亲和力（$K_m$ 越小，亲和力越高）
-        - $K_i$: 产物抑制常数，表示半乳糖对酶的抑制强度（$K_i$ 越小，抑制越强）
-        """,
-        "equation_desc": "上述方程考虑了产物半乳糖对酶活的不同抑制机制。",
-        "inhibition_type": "产物抑制类型",
-        "competitive": "竞争性抑制",
-        "non_competitive": "非竞争性抑制",
-        "uncompetitive": "反竞争性抑制",
-        "inhibition_types_desc": {
-            "competitive": "抑制剂与底物竞争酶的活性位点",
-            "non_competitive": "抑制剂结合在酶的其他部位，降低酶活性",
-            "uncompetitive": "抑制剂只与酶-底物复合物结合"
-        },
-        "compare_inhibition": "比较有无产物抑制的模拟结果",
-        "final_lactose": "最终乳糖浓度",
-        "final_galactose": "最终半乳糖浓度",
-        "conversion_rate": "转化率",
-        "download_data": "下载模拟数据 (Excel)",
-        "rate_analysis": "反应速率分析",
-        "max_rate": "最大反应速率: **{:.2f} mM/小时** (发生在 {:.1f} 小时)",
-        "exercises": "练习题",
-        "exercise_content": """
-        1. 如果酶浓度加倍，乳糖水解速率会如何变化？尝试调整参数并观察结果。
-        2. 在什么条件下，产物抑制对反应速率的影响最小？调整 $K_i$ 值并分析。
-        3. 使用模拟工具，找到使转化率达到90%所需的最短反应时间。
-        """,
-        "error": "计算错误: {}",
-        "copyright": "© 生物反应工程教学模拟器 | 基于Michaelis-Menten动力学与产物抑制模型",
-        "lb_chart": "Lineweaver-Burk 图表",
-        "fixed_galactose": "固定半乳糖浓度 (mM)",
-        "lb_explanation": {
-            "competitive": "蓝色线条表示无抑制剂情况，遵循标准Michaelis-Menten动力学。红色线条表示固定半乳糖浓度下的竞争性抑制。注意两条线在y轴上的交点相同（绿色点），这表明竞争性抑制不影响 $V_{{max}}$，但改变了表观 $K_m$（与X轴负半轴的交点不同，蓝色和红色星号）。",
-            "non_competitive": "蓝色线条表示无抑制剂情况，遵循标准Michaelis-Menten动力学。红色线条表示固定半乳糖浓度下的非竞争性抑制。注意两条线在x轴上的交点相同（绿色星号），这表明非竞争性抑制不影响 $K_m$，但改变了表观 $V_{{max}}$（与y轴的交点不同）。",
-            "uncompetitive": "蓝色线条表示无抑制剂情况，遵循标准Michaelis-Menten动力学。红色线条表示固定半乳糖浓度下的反竞争性抑制。注意两条线平行（斜率相同），这表明反竞争性抑制同时改变了 $K_m$ 和 $V_{{max}}$，但斜率不变。"
-        },
-        "time_label": "时间 (小时)",
-        "concentration_label": "浓度 (mM)",
-        "substrate_label": "底物浓度 L (mM)",
-        "rate_label": "反应速率 (mM/小时)",
-        "no_inhibition": "无抑制"
-    },
-    "en": {
-        "title": "🍼 Lactose Hydrolysis Kinetics Simulation - Educational Version",
-        "intro": """
-        ### Welcome to Lactose Hydrolysis Simulation
-        Lactose hydrolysis is the process where lactose is broken down into galactose and glucose by β-galactosidase, widely used in the food industry (e.g., lactose-free products). This tool simulates this process using a kinetic model, helping you understand enzyme catalysis and product inhibition effects.
-
-        **Learning Objectives:**
-        - Understand the basics of Michaelis-Menten kinetics.
-        - Explore how product inhibition (galactose) affects reaction rates.
-        - Investigate parameter effects on lactose hydrolysis through interactive simulation.
-        """,
-        "model_desc": "This model simulates lactose hydrolysis by β-galactosidase, considering product inhibition (galactose inhibition).",
-        "equation": r"""
-        **Kinetic Equations for Three Inhibition Types:**
-
-        **1. Competitive Inhibition:** 
-        $$ r = \frac{V_{max} \cdot L}{K_m \cdot (1 + \frac{Gal}{K_i}) + L} $$
-
-        **2. Non-competitive Inhibition:** 
-        $$ r = \frac{V_{max} \cdot L}{(K_m + L) \cdot (1 + \frac{Gal}{K_i})} $$
-
-        **3. Uncompetitive Inhibition:** 
-        $$ r = \frac{V_{max} \cdot L}{K_m + L \cdot (1 + \frac{Gal}{K_i})} $$
-        """,
-        "gal_desc": "where $Gal = L_0 - L$ represents the concentration of produced galactose",
-        "reaction_params": "Reaction Parameters",
-        "initial_lactose": "Initial Lactose Concentration (mM) - Amount of lactose at the start",
-        "enzyme_conc": "Enzyme Concentration (U/mL) - Key factor determining reaction rate",
-        "reaction_time": "Reaction Time (hours) - Total simulation duration",
-        "kinetic_params": "Kinetic Parameters",
-        "km": "Km (mM) - Michaelis Constant, indicating enzyme-substrate affinity",
-        "ki": "Ki (mM) - Inhibition Constant, indicating galactose inhibition strength",
-        "steps": "Simulation Precision - Number of calculation points",
-        "theory": "Theoretical Background",
-        "theory_content": """
-        **Kinetic Model:**
-        - $L$: Lactose concentration (mM)
-        - $Gal$: Galactose concentration (mM)
-        - $V_{max}$: Maximum reaction rate, proportional to enzyme concentration ($E$)
-        - $K_m$: Michaelis constant, indicating enzyme-substrate affinity (lower $K_m$, higher affinity)
-        - $K_i$: Product inhibition constant, indicating galactose inhibition strength (lower $K_i$, stronger inhibition)
-        """,
-        "equation_desc": "These equations account for different inhibition mechanisms of the enzyme by the product galactose.",
-        "inhibition_type": "Product Inhibition Type",
-        "competitive": "Competitive Inhibition",
-        "non_competitive": "Non-competitive Inhibition",
-        "uncompetitive": "Uncompetitive Inhibition",
-        "inhibition_types_desc": {
-            "competitive": "Inhibitor competes with substrate for active site",
-            "non_competitive": "Inhibitor binds to enzyme at different site, reducing activity",
-            "uncompetitive": "Inhibitor binds only to enzyme-substrate complex"
-        },
-        "compare_inhibition": "Compare Simulation with and without Product Inhibition",
-        "final_lactose": "Final Lactose Concentration",
-        "final_galactose": "Final Galactose Concentration",
-        "conversion_rate": "Conversion Rate",
-        "download_data": "Download Simulation Data (Excel)",
-        "rate_analysis": "Reaction Rate Analysis",
-        "max_rate": "Maximum Reaction Rate: **{:.2f} mM/hour** (occurs at {:.1f} hours)",
-        "exercises": "Exercises",
-        "exercise_content": """
-        1. How does doubling the enzyme concentration affect the hydrolysis rate? Adjust the parameters and observe.
-        2. Under what conditions is the effect of product inhibition minimal? Adjust $K_i$ and analyze.
-        3. Use the tool to find the shortest reaction time needed for a 90% conversion rate.
-        """,
-        "error": "Calculation Error: {}",
-        "copyright": "© Bioreaction Engineering Educational Simulator | Based on Michaelis-Menten Kinetics with Product Inhibition Model",
-        "lb_chart": "Lineweaver-Burk Plot",
-        "fixed_galactose": "Fixed Galactose Concentration (mM)",
-        "lb_explanation": {
-            "competitive": "Blue line represents no inhibitor case, following standard Michaelis-Menten kinetics. Red line represents competitive inhibition at fixed galactose concentration. Note that both lines intersect at the same point on the y-axis (green point), indicating that competitive inhibition does not affect $V_{{max}}$, but changes the apparent $K_m$ (different intercepts on the negative x-axis, blue and red stars).",
-            "non_competitive": "Blue line represents no inhibitor case, following standard Michaelis-Menten kinetics. Red line represents non-competitive inhibition at fixed galactose concentration. Note that both lines intersect at the same point on the x-axis (green star), indicating that non-competitive inhibition does not affect $K_m$, but changes the apparent $V_{{max}}$ (different intercepts on the y-axis).",
-            "uncompetitive": "Blue line represents no inhibitor case, following standard Michaelis-Menten kinetics. Red line represents uncompetitive inhibition at fixed galactose concentration. Note that both lines are parallel (same slope), indicating that uncompetitive inhibition changes both $K_m$ and $V_{{max}}$, but the slope remains constant."
-        },
-        "time_label": "Time (hours)",
-        "concentration_label": "Concentration (mM)",
-        "substrate_label": "Substrate Concentration L (mM)",
-        "rate_label": "Reaction Rate (mM/hour)",
-        "no_inhibition": "No Inhibition"
-    }
-}
-
-t = translations[lang]
+t = TRANSLATIONS[lang]
 
 st.title(t["title"])
 st.markdown(t["intro"])
@@ -248,40 +48,21 @@ inhibition_types = st.sidebar.multiselect(
     t["inhibition_type"],
     options=[t["competitive"], t["non_competitive"], t["uncompetitive"]],
     default=[t["competitive"], t["non_competitive"], t["uncompetitive"]],
-    help="选择要模拟的抑制类型"
+    help="选择要模拟的抑制类型",
+    key=f"inhibition_types_{lang}"
 )
 
 # 添加抑制类型描述
-if lang == "zh":
-    st.sidebar.markdown("**抑制类型说明:**")
-    st.sidebar.markdown(f"- **{t['competitive']}**: {t['inhibition_types_desc']['competitive']}")
-    st.sidebar.markdown(f"- **{t['non_competitive']}**: {t['inhibition_types_desc']['non_competitive']}")
-    st.sidebar.markdown(f"- **{t['uncompetitive']}**: {t['inhibition_types_desc']['uncompetitive']}")
-else:
-    st.sidebar.markdown("**Inhibition Type Descriptions:**")
-    st.sidebar.markdown(f"- **{t['competitive']}**: {t['inhibition_types_desc']['competitive']}")
-    st.sidebar.markdown(f"- **{t['non_competitive']}**: {t['inhibition_types_desc']['non_competitive']}")
-    st.sidebar.markdown(f"- **{t['uncompetitive']}**: {t['inhibition_types_desc']['uncompetitive']}")
+st.sidebar.markdown(INHIBITION_DESC[lang])
 
 # 主界面
 st.markdown(t["model_desc"])
 
 # 添加米氏方程介绍
-st.markdown("### 米氏方程 (Michaelis-Menten Equation)" if lang == "zh" else "### Michaelis-Menten Equation")
-st.markdown(
-    r"酶催化反应的基本动力学方程：" if lang == "zh" else "The fundamental kinetic equation for enzyme-catalyzed reactions:")
-st.markdown(r"$$ r = \frac{V_{max} \cdot L}{K_m + L} $$")
-st.markdown(r"其中：" if lang == "zh" else "Where:")
-st.markdown(r"- $r$: 反应速率 (mM/小时)" if lang == "zh" else "- $r$: Reaction rate (mM/hour)")
-st.markdown(r"- $V_{max}$: 最大反应速率 (mM/小时)" if lang == "zh" else "- $V_{max}$: Maximum reaction rate (mM/hour)")
-st.markdown(r"- $L$: 底物浓度 (mM)" if lang == "zh" else "- $L$: Substrate concentration (mM)")
-st.markdown(
-    r"- $K_m$: 米氏常数 (mM)，表示酶对底物的亲和力" if lang == "zh" else "- $K_m$: Michaelis constant (mM), indicating enzyme-substrate affinity")
-
-# 添加产物抑制模型介绍
-st.markdown("### 产物抑制模型" if lang == "zh" else "### Product Inhibition Model")
-st.markdown(t["equation"])  # 显示三种抑制类型的方程
-st.markdown(t["gal_desc"])
+st.markdown(MICHAELIS_MENTEN[lang])
+
+# 添加产物抑制模型介绍（三种抑制类型的方程）
+st.markdown(PRODUCT_INHIBITION[lang])
 
 # 创建两列布局
 col1, col2 = st.columns(2)
@@ -294,7 +75,8 @@ with col1:
         max_value=500.0,
         value=200.0,
         step=0.1,
-        help="反应开始时的乳糖浓度 (mM)" if lang == "zh" else "Initial lactose concentration (mM)"
+        help="反应开始时的乳糖浓度 (mM)" if lang == "zh" else "Initial lactose concentration (mM)",
+        key="L0"
     )
     E = st.slider(
         label=t["enzyme_conc"],
@@ -302,7 +84,8 @@ with col1:
         max_value=10.0,
         value=1.0,
         step=0.001,
-        help="酶浓度 (U/mL)，影响反应速率" if lang == "zh" else "Enzyme concentration (U/mL), key factor determining reaction rate"
+        help="酶浓度 (U/mL)，影响反应速率" if lang == "zh" else "Enzyme concentration (U/mL), key factor determining reaction rate",
+        key="E"
     )
     t_max = st.slider(
         label=t["reaction_time"],
@@ -310,7 +93,8 @@ with col1:
         max_value=12.0,
         value=1.0,
         step=0.01,
-        help="模拟的反应时间 (小时)" if lang == "zh" else "Simulation reaction time (hours)"
+        help="模拟的反应时间 (小时)" if lang == "zh" else "Simulation reaction time (hours)",
+        key="t_max"
     )
 
 with col2:
@@ -321,7 +105,8 @@ with col2:
         max_value=50.0,
         value=30.0,
         step=0.1,
-        help="米氏常数 (mM)，表示酶对底物的亲和力" if lang == "zh" else "Michaelis constant (mM), indicating enzyme-substrate affinity"
+        help="米氏常数 (mM)，表示酶对底物的亲和力" if lang == "zh" else "Michaelis constant (mM), indicating enzyme-substrate affinity",
+        key="Km"
     )
     Ki = st.slider(
         label=t["ki"],
@@ -329,7 +114,8 @@ with col2:
         max_value=50.0,
         value=10.0,
         step=0.1,
-        help="抑制常数 (mM)，表示半乳糖的抑制强度" if lang == "zh" else "Inhibition constant (mM), indicating galactose inhibition strength"
+        help="抑制常数 (mM)，表示半乳糖的抑制强度" if lang == "zh" else "Inhibition constant (mM), indicating galactose inhibition strength",
+        key="Ki"
     )
     steps = st.slider(
         label=t["steps"],
@@ -337,7 +123,8 @@ with col2:
         max_value=500,
         value=200,
         step=1,
-        help="数值计算的步数，影响模拟精度" if lang == "zh" else "Number of calculation points, affects simulation precision"
+        help="数值计算的步数，影响模拟精度" if lang == "zh" else "Number of calculation points, affects simulation precision",
+        key="steps"
     )
 
 # 理论背景
@@ -346,37 +133,198 @@ with st.expander(t["theory"]):
     st.markdown(t["equation_desc"])
 
 
+# 设置全局字体以支持中文 - 每个进程只执行一次，首次绘图前才导入 matplotlib
+@st.cache_resource
+def load_matplotlib():
+    import matplotlib.pyplot as plt
+    import matplotlib.font_manager as fm
+
+    try:
+        # 获取当前文件所在目录
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        fonts_dir = os.path.join(current_dir, 'fonts')
+
+        # 确保 fonts 目录存在
+        if not os.path.exists(fonts_dir):
+            os.makedirs(fonts_dir)
+
+        # 检查字体文件是否存在，如果不存在则尝试下载
+        simhei_path = os.path.join(fonts_dir, 'simhei.ttf')
+        msyh_path = os.path.join(fonts_dir, 'msyh.ttf')
+
+        if not os.path.exists(simhei_path):
+            # 从 GitHub 下载 SimHei 替代字体
+            simhei_url = "https://github.com/googlefonts/noto-cjk/raw/main/Sans/OTF/SimplifiedChinese/NotoSansCJKsc-Regular.otf"
+            urllib.request.urlretrieve(simhei_url, simhei_path)
+
+        if not os.path.exists(msyh_path):
+            # 从 GitHub 下载 Microsoft YaHei 替代字体
+            msyh_url = "https://github.com/googlefonts/noto-cjk/raw/main/Sans/OTF/SimplifiedChinese/NotoSansCJKsc-Regular.otf"
+            urllib.request.urlretrieve(msyh_url, msyh_path)
+
+        # 添加字体目录到字体路径
+        font_files = fm.findSystemFonts(fontpaths=[fonts_dir])
+        for font_file in font_files:
+            fm.fontManager.addfont(font_file)
+
+        # 设置中文字体
+        plt.rcParams['font.sans-serif'] = ['Noto Sans SC', 'SimHei', 'Microsoft YaHei', 'Arial Unicode MS', 'sans-serif']
+        plt.rcParams['axes.unicode_minus'] = False
+
+        # 验证字体是否加载成功
+        zh_font = fm.FontProperties(fname=simhei_path)
+
+        return plt, zh_font, None
+
+    except Exception as e:
+        # 如果找不到中文字体，使用默认字体
+        zh_font = fm.FontProperties()
+        plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial Unicode MS', 'sans-serif']
+        plt.rcParams['axes.unicode_minus'] = False
+        return plt, zh_font, str(e)
+
+
+# 后台任务队列 - 每个服务器进程共享一个进程池，限制并发求解数
+@st.cache_resource
+def get_job_queue():
+    return JobQueue()
+
+
+# 历史记录存储 - 默认保存在脚本目录下的 runs.sqlite，可通过环境变量 LACTOSE_RUN_STORE 指定
+@st.cache_resource
+def get_run_store():
+    default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runs.sqlite")
+    return RunStore(os.environ.get("LACTOSE_RUN_STORE", default_path))
+
+
 # 模拟函数 - 修改为支持多种抑制类型
 @st.cache_data
 def solve_model(L0, Vmax, Km, Ki, t_max, steps, inhibition_type):
-    if L0 <= 0 or Vmax <= 0 or Km <= 0 or Ki <= 0:
-        raise ValueError("参数必须为正数")
-    t_min = np.linspace(0, t_max * 60, steps)
-    sol = odeint(model, L0, t_min, args=(Vmax, Km, Ki, L0, inhibition_type))
-    L = sol[:, 0]
-    Gal = np.maximum(L0 - L, 0)
-    t_hour = t_min / 60
-    rates = np.abs(np.gradient(L, t_hour))
-    return t_hour, L, Gal, rates
-
-
-def model(L, t, Vmax, Km, Ki, L0, inhibition_type):
-    L = max(L, 1e-6)
-    Gal = L0 - L
-
-    # 根据抑制类型选择不同的动力学方程
-    if inhibition_type == "competitive":
-        denominator = Km * (1 + Gal / Ki) + L
-    elif inhibition_type == "non_competitive":
-        denominator = (Km + L) * (1 + Gal / Ki)
-    elif inhibition_type == "uncompetitive":
-        denominator = Km + L * (1 + Gal / Ki)
-    else:
-        denominator = Km + L  # 无抑制
+    # 优先使用后台任务（如参数扫描）已经算好的结果
+    # 缓存中只保存时间轴与 L，Gal 与反应速率在使用时计算
+    result = get_job_queue().cache.get(cache_key(L0, Vmax, Km, Ki, t_max, steps, inhibition_type))
+    if result is None:
+        result = CompactResult.from_simulation(L0, simulate(L0, Vmax, Km, Ki, t_max, steps, inhibition_type))
+    return result
+
 
-    dLdt = -Vmax * L / denominator
-    return dLdt
+# 导出 Excel 工作簿 - 按参数缓存
+@st.cache_data
+def build_workbook(L0, Vmax, Km, Ki, t_max, steps, result_keys, lang):
+    # 创建Excel文件（openpyxl 与 pandas 在首次导出时才导入）
+    import pandas as pd
+    from openpyxl import Workbook
+    from openpyxl.utils.dataframe import dataframe_to_rows
+
+    t = TRANSLATIONS[lang]
+
+    wb = Workbook()
+    # 移除默认创建的工作表
+    if 'Sheet' in wb.sheetnames:
+        del wb['Sheet']
+
+    # 为每种情况添加工作表
+    for inhibition_type in result_keys:
+        t_hour, L, Gal, rates = solve_model(L0, Vmax, Km, Ki, t_max, steps, inhibition_type)
+        # 根据抑制类型确定工作表名称
+        if inhibition_type == "no_inhibition":
+            sheet_name = t["no_inhibition"]
+        elif inhibition_type == "competitive":
+            sheet_name = "竞争性抑制" if lang == "zh" else "Competitive"
+        elif inhibition_type == "non_competitive":
+            sheet_name = "非竞争性抑制" if lang == "zh" else "Non-competitive"
+        elif inhibition_type == "uncompetitive":
+            sheet_name = "反竞争性抑制" if lang == "zh" else "Uncompetitive"
+        else:
+            sheet_name = inhibition_type
+
+        # 截断工作表名称（Excel限制31字符）
+        sheet_name = sheet_name[:30]
+
+        ws = wb.create_sheet(title=sheet_name)
+
+        # 创建DataFrame
+        if lang == "zh":
+            df = pd.DataFrame({
+                '时间 (小时)': t_hour,
+                '乳糖浓度 (mM)': L,
+                '半乳糖浓度 (mM)': Gal,
+                '反应速率 (mM/小时)': rates
+            })
+        else:
+            df = pd.DataFrame({
+                'Time (hours)': t_hour,
+                'Lactose (mM)': L,
+                'Galactose (mM)': Gal,
+                'Reaction Rate (mM/hour)': rates
+            })
+
+        # 将数据写入工作表
+        for r in dataframe_to_rows(df, index=False, header=True):
+            ws.append(r)
+
+    # 保存Excel文件
+    excel_buffer = BytesIO()
+    wb.save(excel_buffer)
+    return excel_buffer.getvalue()
+
+
+# 酶用量优化结果与帕累托前沿图 - 按输入缓存，图表以 PNG 字节保存，命中时不再调用 matplotlib
+@st.cache_data
+def build_dosing_report(L0, Km, Ki, dosing_keys, target, enzyme_price, reactor_cost, volume_L, time_limit, lang):
+    plt, zh_font, _ = load_matplotlib()
+    t = TRANSLATIONS[lang]
+    key_names = {key: t[key] for key in ("no_inhibition", "competitive", "non_competitive", "uncompetitive")}
+
+    lines = []
+    for dosing_key in dosing_keys:
+        optimum = optimal_dosing(L0, Km, Ki, dosing_key, target, enzyme_price, reactor_cost, volume_L * 1000,
+                                 (0.001, 10.0), time_limit)
+        if optimum["feasible"]:
+            lines.append(t["dosing_result"].format(
+                key_names[dosing_key], float(optimum["E"]), float(optimum["t_max"]),
+                float(optimum["total_cost"]), float(optimum["enzyme_cost"]), float(optimum["reactor_cost"])))
+        else:
+            lines.append(t["dosing_infeasible"].format(key_names[dosing_key]))
+
+    # 帕累托前沿：第一个选中的抑制类型，多个初始乳糖浓度一次性计算
+    dosing_key = dosing_keys[1] if len(dosing_keys) > 1 else "no_inhibition"
+    dosing_L0_values = np.unique(np.round(np.clip(L0 * np.array([0.25, 0.5, 1.0, 1.5, 2.0]), 0.1, 500.0), 1))
+    front = pareto_front(dosing_L0_values, Km, Ki, dosing_key, target, enzyme_price, reactor_cost,
+                         volume_L * 1000, t_max_limit=time_limit)
+    fig_pf, ax_pf = plt.subplots(figsize=(10, 6))
+    for i, front_L0 in enumerate(front["L0"]):
+        feasible = front["feasible"][i]
+        line, = ax_pf.plot(front["enzyme_cost"][i][feasible], front["t_max"][i][feasible], linewidth=2.5,
+                           label=f"L0 = {front_L0:g} mM")
+        if front["optimum"]["feasible"][i]:
+            ax_pf.plot(front["optimum"]["enzyme_cost"][i], front["optimum"]["t_max"][i], '*',
+                       color=line.get_color(), markersize=14)
+    ax_pf.plot([], [], 'k*', markersize=14, label=t["dosing_optimum"])
+    ax_pf.set_xscale('log')
+    ax_pf.set_xlabel(t["dosing_enzyme_cost"], fontsize=12, fontproperties=zh_font if lang == "zh" else None)
+    ax_pf.set_ylabel(t["time_label"], fontsize=12, fontproperties=zh_font if lang == "zh" else None)
+    ax_pf.set_title(f'{t["dosing_pareto"]} - {key_names[dosing_key]}', fontsize=14,
+                    fontproperties=zh_font if lang == "zh" else None)
+    ax_pf.grid(True, linestyle='--', alpha=0.7)
+    ax_pf.legend(loc='best', prop=zh_font if lang == "zh" else None)
+    ax_pf.set_ylim([0, time_limit])
+    for spine in ax_pf.spines.values():
+        spine.set_linewidth(2.5)
+    image = BytesIO()
+    fig_pf.savefig(image, format="png", bbox_inches="tight", dpi=200)
+    plt.close(fig_pf)
+    return lines, image.getvalue()
+
+
+# 后台任务运行中时需要定时刷新页面
+refresh_needed = False
 
+plt, zh_font, font_error = load_matplotlib()
+if font_error is None:
+    st.sidebar.success("中文字体已成功加载")
+else:
+    st.sidebar.warning(f"无法加载中文字体: {font_error}，图表中文显示可能异常")
 
 try:
     Vmax = E
@@ -398,11 +346,11 @@ try:
     all_results = {}
 
     # 处理无抑制情况
-    t_hour_no_inh, L_no_inh, Gal_no_inh, rates_no_inh = solve_model(L0, Vmax, Km, Ki, t_max, steps, "no_inhibition")
-    all_results["no_inhibition"] = (t_hour_no_inh, L_no_inh, Gal_no_inh, rates_no_inh)
-    ax.plot(t_hour_no_inh, L_no_inh, '--', color=colors["no_inhibition"], linewidth=2.5,
+    all_results["no_inhibition"] = solve_model(L0, Vmax, Km, Ki, t_max, steps, "no_inhibition")
+    t_hour_no_inh, L_no_inh, Gal_no_inh, rates_no_inh = all_results["no_inhibition"]
+    ax.plot(*decimate_xy(t_hour_no_inh, L_no_inh, PLOT_POINTS), '--', color=colors["no_inhibition"], linewidth=2.5,
             label=f"乳糖 ({t['no_inhibition']})" if lang == "zh" else f"Lactose ({t['no_inhibition']})")
-    ax.plot(t_hour_no_inh, Gal_no_inh, '--', color='#FF7F0E', linewidth=2.5,
+    ax.plot(*decimate_xy(t_hour_no_inh, Gal_no_inh, PLOT_POINTS), '--', color='#FF7F0E', linewidth=2.5,
             label=f"半乳糖 ({t['no_inhibition']})" if lang == "zh" else f"Galactose ({t['no_inhibition']})")
 
     # 处理选中的抑制类型
@@ -420,13 +368,13 @@ try:
         else:
             continue
 
-        t_hour, L, Gal, rates = solve_model(L0, Vmax, Km, Ki, t_max, steps, key)
-        all_results[key] = (t_hour, L, Gal, rates)
+        all_results[key] = solve_model(L0, Vmax, Km, Ki, t_max, steps, key)
+        t_hour, L, Gal, rates = all_results[key]
 
         # 绘制乳糖和半乳糖曲线
-        ax.plot(t_hour, L, color=colors[key], linewidth=2.5,
+        ax.plot(*decimate_xy(t_hour, L, PLOT_POINTS), color=colors[key], linewidth=2.5,
                 label=f"乳糖 ({label_prefix}抑制)" if lang == "zh" else f"Lactose ({label_prefix} Inhibition)")
-        ax.plot(t_hour, Gal, color=colors[key], linestyle=':', linewidth=2.5,
+        ax.plot(*decimate_xy(t_hour, Gal, PLOT_POINTS), color=colors[key], linestyle=':', linewidth=2.5,
                 label=f"半乳糖 ({label_prefix}抑制)" if lang == "zh" else f"Galactose ({label_prefix} Inhibition)")
 
         # 添加转化率标注
@@ -488,73 +436,32 @@ try:
                 t["conversion_rate"]: f"{conversion:.1f}%"
             })
 
-        # 显示结果表格
+        # 显示结果表格（pandas 在首次使用时才导入）
+        import pandas as pd
         results_df = pd.DataFrame(results_data)
         st.table(results_df)
 
     # 数据下载 - 包含所有情况的数据
     if all_results:
-        # 创建Excel文件
-        from openpyxl import Workbook
-        from openpyxl.utils.dataframe import dataframe_to_rows
-
-        wb = Workbook()
-        # 移除默认创建的工作表
-        if 'Sheet' in wb.sheetnames:
-            del wb['Sheet']
-
-        # 为每种情况添加工作表
-        for inhibition_type, (t_hour, L, Gal, rates) in all_results.items():
-            # 根据抑制类型确定工作表名称
-            if inhibition_type == "no_inhibition":
-                sheet_name = t["no_inhibition"]
-            elif inhibition_type == "competitive":
-                sheet_name = "竞争性抑制" if lang == "zh" else "Competitive"
-            elif inhibition_type == "non_competitive":
-                sheet_name = "非竞争性抑制" if lang == "zh" else "Non-competitive"
-            elif inhibition_type == "uncompetitive":
-                sheet_name = "反竞争性抑制" if lang == "zh" else "Uncompetitive"
-            else:
-                sheet_name = inhibition_type
-
-            # 截断工作表名称（Excel限制31字符）
-            sheet_name = sheet_name[:30]
-
-            ws = wb.create_sheet(title=sheet_name)
-
-            # 创建DataFrame
-            if lang == "zh":
-                df = pd.DataFrame({
-                    '时间 (小时)': t_hour,
-                    '乳糖浓度 (mM)': L,
-                    '半乳糖浓度 (mM)': Gal,
-                    '反应速率 (mM/小时)': rates
-                })
-            else:
-                df = pd.DataFrame({
-                    'Time (hours)': t_hour,
-                    'Lactose (mM)': L,
-                    'Galactose (mM)': Gal,
-                    'Reaction Rate (mM/hour)': rates
-                })
-
-            # 将数据写入工作表
-            for r in dataframe_to_rows(df, index=False, header=True):
-                ws.append(r)
-
-        # 保存Excel文件
-        excel_buffer = BytesIO()
-        wb.save(excel_buffer)
-        excel_buffer.seek(0)
+        # 工作簿按参数缓存，参数不变时的重新运行不再重复生成
+        excel_data = build_workbook(L0, Vmax, Km, Ki, t_max, steps, tuple(all_results), lang)
 
         # 提供下载按钮
         st.download_button(
             label=t["download_data"],
-            data=excel_buffer,
+            data=excel_data,
             file_name='lactose_hydrolysis_data.xlsx',
             mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         )
 
+        # 保存到历史记录（一次批量写入所有抑制类型）
+        if st.button(t["save_run"]):
+            saved = get_run_store().add_runs(
+                ((L0, Vmax, Km, Ki, t_max, steps, inhibition_type), result)
+                for inhibition_type, result in all_results.items()
+            )
+            st.success(t["run_saved"].format(saved))
+
     # 反应速率分析图 - 始终显示无抑制情况
     st.subheader(t["rate_analysis"])
     if all_results:  # 只要有无抑制结果就执行
@@ -562,7 +469,7 @@ try:
         t_hour_no_inh, L_no_inh, Gal_no_inh, rates_no_inh = all_results["no_inhibition"]
 
         fig2, ax2 = plt.subplots(figsize=(10, 6))
-        ax2.plot(L_no_inh, rates_no_inh, 'b--', linewidth=2.5,
+        ax2.plot(*decimate_xy(L_no_inh, rates_no_inh, PLOT_POINTS), 'b--', linewidth=2.5,
                  label=t["no_inhibition"])
 
         # 如果选择了抑制类型，添加第一个抑制类型的结果
@@ -580,7 +487,7 @@ try:
 
             if key in all_results:
                 t_hour, L, Gal, rates = all_results[key]
-                ax2.plot(L, rates, color=colors[key], linewidth=2.5,
+                ax2.plot(*decimate_xy(L, rates, PLOT_POINTS), color=colors[key], linewidth=2.5,
                          label=first_itype)
 
                 # 找到最大反应速率及其发生时间（抑制类型）
@@ -708,7 +615,7 @@ try:
                 key = "competitive"
                 display_key = t["competitive"]
 
-            Gal_fixed = st.slider(t["fixed_galactose"], 0.0, 200.0, 100.0)
+            Gal_fixed = st.slider(t["fixed_galactose"], 0.0, 200.0, 100.0, key="gal_fixed")
             S_range = np.linspace(1, 500, 20)
 
             if key == "competitive":
@@ -822,6 +729,194 @@ try:
             # 显示解释文本
             st.markdown(t["lb_explanation"][key])
 
+    # 将显示名称映射到内部标识符
+    key_names = {
+        "no_inhibition": t["no_inhibition"],
+        "competitive": t["competitive"],
+        "non_competitive": t["non_competitive"],
+        "uncompetitive": t["uncompetitive"]
+    }
+    sweep_keys = ["no_inhibition"] + [k for itype in inhibition_types for k, name in key_names.items()
+                                      if name == itype and k != "no_inhibition"]
+
+    # 参数扫描 - 在后台进程池中运行，页面只显示进度，不阻塞脚本线程
+    # 支持 fragment 时（Streamlit >= 1.37），扫描区域的交互与进度轮询只重新运行该区域，不重绘整个页面
+    if hasattr(st, "fragment"):
+        sweep_fragment = st.fragment
+        progress_fragment = st.fragment(run_every=0.5)
+    else:
+        sweep_fragment = progress_fragment = lambda func: func
+
+    @progress_fragment
+    def show_sweep_progress(job_id):
+        sweep_job = get_job_queue().get(job_id)
+        if sweep_job is None or sweep_job.is_finished():
+            # 扫描结束：重新运行一次页面以显示结果（不支持 fragment 时由脚本末尾的整页刷新处理）
+            if hasattr(st, "fragment"):
+                st.rerun()
+            return
+        st.progress(sweep_job.progress)
+        st.caption(t["sweep_progress"].format(sweep_job.completed, sweep_job.total))
+
+    @sweep_fragment
+    def sweep_section(L0, Vmax, Km, Ki, t_max, steps, sweep_keys):
+        # 返回扫描是否仍在运行（仅在不支持 fragment 时用于整页定时刷新）
+        st.subheader(t["sweep"])
+        sweep_options = {"L0": t["initial_lactose"], "Vmax": t["enzyme_conc"], "Km": t["km"], "Ki": t["ki"]}
+        sweep_limits = {"L0": (0.1, 500.0), "Vmax": (0.001, 10.0), "Km": (0.1, 50.0), "Ki": (0.1, 50.0)}
+        sweep_param = st.selectbox(t["sweep_param"], list(sweep_options), format_func=lambda k: sweep_options[k])
+        sweep_min, sweep_max = sweep_limits[sweep_param]
+        sweep_range = st.slider(t["sweep_range"], sweep_min, sweep_max, (sweep_min, sweep_max))
+        sweep_points = st.slider(t["sweep_points"], 5, 100, 20)
+        sweep_signature = (L0, Vmax, Km, Ki, t_max, steps, tuple(sweep_keys), sweep_param, tuple(sweep_range),
+                           sweep_points)
+
+        # 每个浏览器会话的标识，后台任务以此作为 owner，便于取消该会话提交的全部任务
+        if "session_id" not in st.session_state:
+            st.session_state["session_id"] = uuid.uuid4().hex
+        session_id = st.session_state["session_id"]
+
+        job_queue = get_job_queue()
+        sweep_state = st.session_state.get("sweep_job")
+        sweep_job = job_queue.get(sweep_state["id"]) if sweep_state else None
+
+        # 参数改变时取消本会话尚未完成的扫描，已完成的旧结果也不再显示
+        if sweep_state and (sweep_job is None or sweep_state["signature"] != sweep_signature):
+            if job_queue.cancel_owner(session_id):
+                st.info(t["sweep_cancelled"])
+            sweep_job = None
+            del st.session_state["sweep_job"]
+
+        sweep_col1, sweep_col2 = st.columns(2)
+        if sweep_col1.button(t["sweep_start"]):
+            job_queue.cancel_owner(session_id)
+            sweep_values = np.linspace(sweep_range[0], sweep_range[1], sweep_points)
+            sweep_job = job_queue.submit(
+                sweep_tasks(L0, Vmax, Km, Ki, t_max, steps, sweep_param, sweep_values, sweep_keys),
+                label=sweep_param,
+                owner=session_id
+            )
+            st.session_state["sweep_job"] = {"id": sweep_job.id, "signature": sweep_signature,
+                                             "values": sweep_values}
+        if sweep_job is not None and not sweep_job.is_finished() and sweep_col2.button(t["sweep_cancel"]):
+            sweep_job.cancel()
+
+        if sweep_job is None:
+            return False
+        if sweep_job.status == RUNNING:
+            show_sweep_progress(sweep_job.id)
+            return True
+        if sweep_job.status == FAILED:
+            st.error(t["sweep_failed"].format(str(sweep_job.error)))
+        elif sweep_job.status == CANCELLED:
+            st.info(t["sweep_stopped"])
+        elif sweep_job.status == DONE:
+            sweep_values = st.session_state["sweep_job"]["values"]
+            fig_sw, ax_sw = plt.subplots(figsize=(10, 6))
+            for i, sweep_key in enumerate(sweep_keys):
+                conversions = []
+                for j in range(len(sweep_values)):
+                    index = j * len(sweep_keys) + i
+                    task_L0 = sweep_job.tasks[index][0]
+                    L_end = sweep_job.results[index].L[-1]
+                    conversions.append((1 - L_end / task_L0) * 100)
+                ax_sw.plot(sweep_values, conversions, color=colors[sweep_key], linewidth=2.5,
+                           linestyle='--' if sweep_key == "no_inhibition" else '-',
+                           label=key_names[sweep_key])
+            ax_sw.set_xlabel(sweep_options[sweep_param], fontsize=12, fontproperties=zh_font if lang == "zh" else None)
+            ax_sw.set_ylabel(f'{t["conversion_rate"]} (%)', fontsize=12,
+                             fontproperties=zh_font if lang == "zh" else None)
+            ax_sw.set_title(t["sweep_result"], fontsize=14, fontproperties=zh_font if lang == "zh" else None)
+            ax_sw.grid(True, linestyle='--', alpha=0.7)
+            ax_sw.legend(loc='best', prop=zh_font if lang == "zh" else None)
+            ax_sw.set_ylim([0, 105])
+            for spine in ax_sw.spines.values():
+                spine.set_linewidth(2.5)
+            st.pyplot(fig_sw)
+
+            if st.button(t["save_sweep"]):
+                saved = get_run_store().add_runs(zip(sweep_job.tasks, sweep_job.results),
+                                                 label=f"sweep:{sweep_param}")
+                st.success(t["run_saved"].format(saved))
+        return False
+
+    refresh_needed = sweep_section(L0, Vmax, Km, Ki, t_max, steps, sweep_keys) and not hasattr(st, "fragment")
+
+    # 酶用量与反应时间优化 - 基于解析的转化时间，不需要重复数值求解
+    with st.expander(t["dosing"]):
+        dosing_col1, dosing_col2 = st.columns(2)
+        dosing_target = dosing_col1.slider(t["dosing_target"], 50.0, 99.5, 90.0, 0.5)
+        dosing_time_limit = dosing_col1.number_input(t["dosing_time_limit"], min_value=0.1, max_value=48.0, value=12.0)
+        dosing_volume = dosing_col1.number_input(t["dosing_volume"], min_value=0.001, value=1.0)
+        dosing_enzyme_price = dosing_col2.number_input(t["dosing_enzyme_price"], min_value=0.000001, value=0.01,
+                                                       format="%.6f")
+        dosing_reactor_cost = dosing_col2.number_input(t["dosing_reactor_cost"], min_value=0.0, value=50.0)
+
+        # 展开区域折叠时代码仍会执行：打开开关后才计算，结果与图表按输入缓存
+        dosing_switch = st.toggle if hasattr(st, "toggle") else st.checkbox
+        if dosing_switch(t["dosing_show"], key="dosing_show"):
+            dosing_lines, dosing_png = build_dosing_report(
+                L0, Km, Ki, tuple(sweep_keys), dosing_target, dosing_enzyme_price, dosing_reactor_cost,
+                dosing_volume, dosing_time_limit, lang)
+            for dosing_line in dosing_lines:
+                st.markdown(dosing_line)
+            st.image(dosing_png)
+
+    # 历史模拟对比 - 查询只读取索引与汇总列，选中记录后才解压轨迹
+    st.subheader(t["run_history"])
+    run_store = get_run_store()
+    history_col1, history_col2, history_col3 = st.columns(3)
+    history_types = history_col1.multiselect(t["history_types"], list(key_names),
+                                             format_func=lambda k: key_names[k])
+    history_ki_max = history_col2.number_input(t["history_ki_max"], min_value=0.1, max_value=50.0, value=50.0)
+    history_conversion_min = history_col3.slider(t["history_conversion_min"], 0.0, 100.0, 0.0)
+    history_rows = run_store.query(inhibition_types=history_types, Ki_max=history_ki_max,
+                                   conversion_min=history_conversion_min)
+    st.caption(t["history_count"].format(run_store.count(), len(history_rows)))
+
+    if not history_rows:
+        st.info(t["history_empty"])
+    else:
+        # 显示历史记录表格（pandas 在首次使用时才导入，不依赖结果表格中的导入）
+        import pandas as pd
+        history_df = pd.DataFrame([{
+            "ID": row["id"],
+            "抑制类型" if lang == "zh" else "Inhibition Type": key_names.get(row["inhibition_type"],
+                                                                            row["inhibition_type"]),
+            "L0 (mM)": row["L0"],
+            "E (U/mL)": row["Vmax"],
+            "Km (mM)": row["Km"],
+            "Ki (mM)": row["Ki"],
+            "t_max (h)": row["t_max"],
+            t["final_lactose"]: round(row["final_lactose"], 1),
+            t["final_galactose"]: round(row["final_galactose"], 1),
+            t["conversion_rate"]: round(row["conversion"], 1),
+            "最大反应速率 (mM/小时)" if lang == "zh" else "Max Rate (mM/hour)": round(row["max_rate"], 2)
+        } for row in history_rows])
+        st.dataframe(history_df)
+
+        history_ids = [row["id"] for row in history_rows]
+        history_selected = st.multiselect(t["history_select"], history_ids, default=history_ids[:3])
+        if history_selected:
+            fig_hist, ax_hist = plt.subplots(figsize=(10, 6))
+            for run_id in history_selected:
+                loaded = run_store.load(run_id)
+                if loaded is None:
+                    continue
+                summary, (t_hour_h, L_h, Gal_h, rates_h) = loaded
+                ax_hist.plot(*decimate_xy(t_hour_h, L_h, PLOT_POINTS), linewidth=2.5,
+                             label=f'#{run_id} {key_names.get(summary["inhibition_type"], summary["inhibition_type"])}'
+                                   f' (Ki={summary["Ki"]:g}, {summary["conversion"]:.1f}%)')
+            ax_hist.set_xlabel(t["time_label"], fontsize=12, fontproperties=zh_font if lang == "zh" else None)
+            ax_hist.set_ylabel(t["concentration_label"], fontsize=12,
+                               fontproperties=zh_font if lang == "zh" else None)
+            ax_hist.set_title(t["history_plot_title"], fontsize=14, fontproperties=zh_font if lang == "zh" else None)
+            ax_hist.grid(True, linestyle='--', alpha=0.7)
+            ax_hist.legend(loc='best', fontsize=10, prop=zh_font if lang == "zh" else None)
+            for spine in ax_hist.spines.values():
+                spine.set_linewidth(2.5)
+            st.pyplot(fig_hist)
+
     # 练习题
     with st.expander(t["exercises"]):
         st.markdown(t["exercise_content"])
@@ -831,3 +926,11 @@ except Exception as e:
     st.stop()
 
 st.caption(t["copyright"])
+
+# 后台任务运行中且不支持 fragment（旧版 Streamlit）：稍后自动重新运行整个脚本以更新进度
+if refresh_needed:
+    time.sleep(0.5)
+    if hasattr(st, "rerun"):
+        st.rerun()
+    else:
+        st.experimental_rerun()